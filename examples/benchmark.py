@@ -0,0 +1,120 @@
+import sys, os, json, time, tracemalloc, subprocess
+
+import numpy as np
+
+
+def cnfg_Orchestration(strglistnumbtarg='1e2,1e3,1e4', typesyst='PlanetarySystem', boolprocmult='False'):
+    '''
+    Benchmark the orchestration layer of troia on synthetic populations of increasing size, with miletos replaced by a stub
+
+    The execution time and the peak traced memory are reported separately for population synthesis, per-target dispatch,
+    result aggregation, and the pergamon stages. The plots are rendered inline, so that the times of the pergamon stages include
+    the rendering, and the time spent waiting for any asynchronous plotting jobs is reported as plotwait.
+
+    Example:
+        python benchmark.py cnfg_Orchestration 1e2,1e3,1e4,1e5,1e6
+    '''
+
+    import troia
+
+    listnumbtarg = [int(float(strg)) for strg in strglistnumbtarg.split(',')]
+    boolprocmult = boolprocmult == 'True'
+
+    # stages of the run to be reported
+    listnamestag = ['popl', 'work', 'aggr', 'plotpopltrue', 'plotfeat', 'plotwait']
+
+    listdictbench = []
+    for numbtarg in listnumbtarg:
+
+        print('Benchmarking troia with %d targets...' % numbtarg)
+
+        tracemalloc.start()
+        timeinit = time.perf_counter()
+
+        gdat = troia.init( \
+                          typesyst=typesyst, \
+                          strgcnfg='Benchmark_%d' % numbtarg, \
+                          listlablinst=[['TESS'], []], \
+                          liststrgtypedata=[['simutargsynt'], []], \
+                          typepopl='SyntheticPopulation', \
+                          numbtarg=numbtarg, \
+                          typemile='stub', \
+                          boolprocmult=boolprocmult, \
+                          boolplot=False, \
+                          boolplotasyn=False, \
+                          booldiag=False, \
+                         )
+
+        timetotl = time.perf_counter() - timeinit
+        tracemalloc.stop()
+
+        dictbench = dict()
+        dictbench['numbtarg'] = numbtarg
+        dictbench['timetotl'] = timetotl
+        for namestag in listnamestag:
+            if namestag in gdat.dicttimestagpopl:
+                dictbench['time' + namestag] = gdat.dicttimestagpopl[namestag][0]
+            else:
+                dictbench['time' + namestag] = np.nan
+            if namestag in gdat.dictmemostagpopl:
+                dictbench['memo' + namestag] = gdat.dictmemostagpopl[namestag]
+            else:
+                dictbench['memo' + namestag] = 0
+        listdictbench.append(dictbench)
+
+    # report
+    print('')
+    strgline = '%10s %10s' % ('numbtarg', 'total [s]')
+    for namestag in listnamestag:
+        strgline += ' %14s %14s' % (namestag + ' [s]', namestag + ' [MB]')
+    print(strgline)
+    for dictbench in listdictbench:
+        strgline = '%10d %10.3g' % (dictbench['numbtarg'], dictbench['timetotl'])
+        for namestag in listnamestag:
+            strgline += ' %14.3g %14.3g' % (dictbench['time' + namestag], dictbench['memo' + namestag] / 2.**20)
+        print(strgline)
+
+    path = os.environ['TROIA_DATA_PATH'] + '/Benchmark_Orchestration.json'
+    print('Writing to %s...' % path)
+    with open(path, 'w') as objtfile:
+        json.dump(listdictbench, objtfile, indent=4)
+
+
+def cnfg_ImportTime(timebudg='1.', numbiter='5'):
+    '''
+    Check that importing troia stays within a budget of wall-clock time and does not import the heavy dependencies
+
+    Example:
+        python benchmark.py cnfg_ImportTime 0.5
+    '''
+
+    timebudg = float(timebudg)
+    numbiter = int(numbiter)
+
+    listnamemodlheav = ['matplotlib', 'scipy', 'tdpy', 'ephesos', 'miletos', 'pergamon', 'nicomedia', 'chalcedon']
+
+    strgcmnd = 'import time; timeinit = time.perf_counter(); import troia, sys; print(time.perf_counter() - timeinit); ' + \
+                                                            'print(",".join([name for name in %s if name in sys.modules]))' % listnamemodlheav
+
+    # troia is imported from the repository that holds this script, wherever the script is run from
+    dictenvi = dict(os.environ)
+    dictenvi['PYTHONPATH'] = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.pathsep + dictenvi.get('PYTHONPATH', '')
+
+    listtime = []
+    for k in range(numbiter):
+        listline = subprocess.check_output([sys.executable, '-c', strgcmnd], text=True, env=dictenvi).split('\n')
+        listtime.append(float(listline[0]))
+        strgmodlheav = listline[1]
+
+    timeimpo = np.median(listtime)
+    print('Median time to import troia over %d trials: %.3g s (budget: %.3g s)' % (numbiter, timeimpo, timebudg))
+    if len(strgmodlheav) > 0:
+        print('Heavy dependencies imported with troia: %s' % strgmodlheav)
+
+    if timeimpo > timebudg or len(strgmodlheav) > 0:
+        print('Import-time budget exceeded.')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    globals().get(sys.argv[1])(*sys.argv[2:])
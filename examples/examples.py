@@ -343,4 +343,5 @@ def cnfg_cycle3_G03254():
               )
 
 
-globals().get(sys.argv[1])(*sys.argv[2:])
+if __name__ == '__main__':
+    globals().get(sys.argv[1])(*sys.argv[2:])
@@ -0,0 +1,27 @@
+import os, sys, json, subprocess
+
+import numpy as np
+import pytest
+
+
+pathbase = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + '/'
+
+
+def test_cnfg_Orchestration(tmp_path):
+
+    # the orchestration benchmark runs the full pipeline with miletos replaced by a stub, which needs the other dependencies
+    for namemodl in ['tdpy', 'nicomedia', 'pergamon', 'ephesos', 'miletos']:
+        pytest.importorskip(namemodl)
+
+    dictenvi = dict(os.environ)
+    dictenvi['TROIA_DATA_PATH'] = str(tmp_path)
+    dictenvi['PYTHONPATH'] = pathbase + os.pathsep + dictenvi.get('PYTHONPATH', '')
+    subprocess.run([sys.executable, pathbase + 'examples/benchmark.py', 'cnfg_Orchestration', '1e2'], env=dictenvi, check=True, timeout=1800)
+
+    with open(str(tmp_path) + '/Benchmark_Orchestration.json', 'r') as objtfile:
+        listdictbench = json.load(objtfile)
+
+    assert listdictbench[0]['numbtarg'] == 100
+    for namestag in ['popl', 'work', 'aggr', 'plotpopltrue', 'plotfeat']:
+        # stages that were not reached are reported as NaN
+        assert np.isfinite(listdictbench[0]['time' + namestag])
@@ -0,0 +1,51 @@
+import types
+
+import numpy as np
+import pytest
+
+import troia.main
+
+
+def retr_gdat(tmp_path, numbtarg=5):
+
+    gdat = types.SimpleNamespace()
+    gdat.numbtarg = numbtarg
+    gdat.indxtarg = np.arange(numbtarg)
+    gdat.strgtarg = np.array(['Target%d' % n for n in gdat.indxtarg])
+    gdat.listticitarg = list(100 + gdat.indxtarg)
+    gdat.listnamestagtarg = ['prep', 'tria', 'mile', 'stat']
+    gdat.booltria = False
+    gdat.boolsimusome = False
+    gdat.pathdatashrd = str(tmp_path) + '/'
+    gdat.boolcomptarg = np.zeros(numbtarg, dtype=bool)
+
+    return gdat
+
+
+@pytest.mark.parametrize('typemile', ['stub', 'full'])
+def test_setp_clasdisp(tmp_path, typemile):
+
+    # the containers are set up before any target is analyzed, from the flags of the type of analysis
+    gdat = retr_gdat(tmp_path)
+    troia.main.setp_clasdisp(gdat, troia.main.retr_dictboolanls(typemile))
+    assert len(gdat.boolpositarg) == gdat.numbtypeclasdisp == len(gdat.dictstat)
+    assert not np.array(gdat.boolpositarg).any()
+    assert sorted(gdat.dicttimestagtarg.keys()) == sorted(gdat.listnamestagtarg)
+
+    # which are those that a result record of this type of analysis would have set up
+    dictmileoutp = troia.main.retr_dictmileoutpstub(None, np.random.default_rng(0))
+    dictmileoutp.update(troia.main.retr_dictboolanls(typemile))
+    dictrslt = troia.main.retr_dictrslttarg(2, dictmileoutp)
+    dictrslt['dicttimestag'] = {namestag: [1., 1.] for namestag in gdat.listnamestagtarg}
+    dictrslt['timeexec'] = 4.
+    dictrslt['boolplot'] = False
+
+    gdatrslt = retr_gdat(tmp_path / 'Result')
+    (tmp_path / 'Result').mkdir()
+    troia.main.setp_rslttarg(gdatrslt, dictrslt)
+    assert gdatrslt.listnameclasdisp == gdat.listnameclasdisp
+    assert gdatrslt.listnamefeatstat == gdat.listnamefeatstat
+
+    troia.main.setp_rslttarg(gdat, dictrslt)
+    assert gdat.boolcomptarg[2]
+    assert np.array_equal(np.array(gdat.boolpositarg)[:, 2], dictrslt['boolposi'])
@@ -0,0 +1,30 @@
+import numpy as np
+
+import troia.main
+
+
+def test_retr_dictconf():
+
+    objtrand = np.random.default_rng(0)
+
+    # target counts that are and are not multiples of the 8 bits of a byte
+    for numbtarg in [1, 7, 8, 9, 100, 1001]:
+        boolposi = objtrand.random((3, numbtarg)) < 0.3
+        boolrele = objtrand.random((2, numbtarg)) < 0.6
+
+        dictconf = troia.main.retr_dictconf(boolposi, boolrele)
+
+        # set operations that the bitsets replace
+        setstarg = set(range(numbtarg))
+        for u in range(boolposi.shape[0]):
+            for v in range(boolrele.shape[0]):
+                setsposi = set(np.where(boolposi[u])[0])
+                setsrele = set(np.where(boolrele[v])[0])
+                dictsets = dict()
+                dictsets['trpo'] = setsposi & setsrele
+                dictsets['trne'] = setstarg - setsposi - setsrele
+                dictsets['flpo'] = setsposi - setsrele
+                dictsets['flne'] = setsrele - setsposi
+                for name, sets in dictsets.items():
+                    assert dictconf['numb'][name][u, v] == len(sets)
+                    assert list(dictconf['indx'][name][u][v]) == sorted(sets)
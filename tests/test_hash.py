@@ -0,0 +1,68 @@
+import sys, types
+
+import numpy as np
+import pytest
+
+import troia.main
+
+
+@pytest.fixture
+def objtmodlmile(monkeypatch):
+    # local stand-in for miletos, of which the fingerprint only reads the version
+    objtmodl = types.ModuleType('miletos')
+    objtmodl.__version__ = '1.0'
+    monkeypatch.setitem(sys.modules, 'miletos', objtmodl)
+    return objtmodl
+
+
+def retr_dictmileinpt():
+
+    dictmileinpt = dict()
+    dictmileinpt['rasctarg'] = 10.
+    dictmileinpt['listtsecsele'] = np.array([1, 2])
+    dictmileinpt['dictlcurtessinpt'] = {'typelcurtpxftess': 'SPOC', 'boolffimonly': False}
+    dictmileinpt['typeverb'] = 1
+    dictmileinpt['boolwritover'] = False
+    dictmileinpt['boolplotpopl'] = True
+    dictmileinpt['pathvisutarg'] = '/visuals/'
+
+    return dictmileinpt
+
+
+def test_retr_strghashmile(objtmodlmile):
+
+    strghash = troia.main.retr_strghashmile(retr_dictmileinpt(), 7)
+
+    # the fingerprint does not depend on the order of the inputs
+    dictmileinpt = dict(reversed(list(retr_dictmileinpt().items())))
+    assert troia.main.retr_strghashmile(dictmileinpt, 7) == strghash
+
+    # inputs that only affect messages, overwriting, and plots do not change the fingerprint
+    for name, valu in [['typeverb', 2], ['boolwritover', True], ['boolplotpopl', False], ['pathvisutarg', '/other/'], ['boolmakeanim', True]]:
+        dictmileinpt = retr_dictmileinpt()
+        dictmileinpt[name] = valu
+        assert troia.main.retr_strghashmile(dictmileinpt, 7) == strghash
+
+    # any effective input, including nested ones, changes the fingerprint
+    listdictmileinpt = []
+    for name, valu in [['rasctarg', 10.5], ['listtsecsele', np.array([1, 3])], ['decltarg', -20.]]:
+        dictmileinpt = retr_dictmileinpt()
+        dictmileinpt[name] = valu
+        listdictmileinpt.append(dictmileinpt)
+    dictmileinpt = retr_dictmileinpt()
+    dictmileinpt['dictlcurtessinpt']['boolffimonly'] = True
+    listdictmileinpt.append(dictmileinpt)
+    for dictmileinpt in listdictmileinpt:
+        assert troia.main.retr_strghashmile(dictmileinpt, 7) != strghash
+
+    # as do the seed of the global random state and the version of miletos
+    assert troia.main.retr_strghashmile(retr_dictmileinpt(), 8) != strghash
+    objtmodlmile.__version__ = '1.1'
+    assert troia.main.retr_strghashmile(retr_dictmileinpt(), 7) != strghash
+
+
+def test_retr_strghash():
+
+    # objects without a stable serialization are rejected instead of being hashed by their address
+    with pytest.raises(TypeError):
+        troia.main.retr_strghash({'objt': object()})
@@ -0,0 +1,31 @@
+import os, sys, subprocess
+
+import numpy as np
+
+
+pathbase = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + '/'
+
+# wall-clock budget of importing troia [s]
+timebudg = 1.
+
+listnamemodlheav = ['matplotlib', 'scipy', 'tdpy', 'miletos', 'pergamon', 'ephesos', 'nicomedia', 'chalcedon']
+
+
+def test_import():
+
+    strgcmnd = 'import time; timeinit = time.perf_counter(); import troia, sys; print(time.perf_counter() - timeinit); ' + \
+                                                            'print(",".join([name for name in %s if name in sys.modules]))' % listnamemodlheav
+
+    dictenvi = dict(os.environ)
+    dictenvi['PYTHONPATH'] = pathbase + os.pathsep + dictenvi.get('PYTHONPATH', '')
+
+    # the median over a few trials is robust to a slow first import from a cold disk cache
+    listtime = []
+    for k in range(3):
+        listline = subprocess.check_output([sys.executable, '-c', strgcmnd], text=True, env=dictenvi).split('\n')
+        listtime.append(float(listline[0]))
+
+        # none of the heavy dependencies is imported with troia
+        assert listline[1] == ''
+
+    assert np.median(listtime) < timebudg
@@ -0,0 +1,73 @@
+import types
+
+import numpy as np
+
+import troia.main
+
+
+def retr_dictrslt(n):
+
+    dictrslt = dict()
+    dictrslt['indxtarg'] = n
+    dictrslt['boolcalclspe'] = np.bool_(n % 2 == 0)
+    dictrslt['boolsrchboxsperi'] = True
+    dictrslt['boolsrchoutlperi'] = False
+    dictrslt['dictfeat'] = {'perilspempow': np.float64(1.5 * n), 'powrlspempow': np.float32(0.25)}
+    dictrslt['boolposi'] = np.array([n % 3 == 0, True])
+    dictrslt['timeexec'] = 2. + n
+    dictrslt['dicttimestag'] = {'anls': [1. + n, 0.5]}
+    dictrslt['boolplot'] = n == 0
+    if n == 1:
+        dictrslt['dicttria'] = {'s2nrtria': np.float64(3.), 'duratria': 0.5}
+
+    return dictrslt
+
+
+def test_read_ledgtarg(tmp_path):
+
+    gdat = types.SimpleNamespace()
+    gdat.strgtarg = np.array(['Target%d' % n for n in range(5)])
+    gdat.numbtarg = gdat.strgtarg.size
+    gdat.pathledgtarg = str(tmp_path) + '/Ledger.jsonl'
+
+    for n in [3, 0, 1]:
+        troia.main.writ_ledgtarg(gdat, retr_dictrslt(n))
+
+    # a crash while the record of the next target was being written leaves a truncated last line
+    with open(gdat.pathledgtarg, 'a') as objtfile:
+        objtfile.write('{"indxtarg": 4, "strgtarg": "Tar')
+
+    listdictrslt = troia.main.read_ledgtarg(gdat, gdat.pathledgtarg)
+    assert [dictrslt['indxtarg'] for dictrslt in listdictrslt] == [3, 0, 1]
+    for dictrslt in listdictrslt:
+        n = dictrslt['indxtarg']
+        dictrsltinpt = retr_dictrslt(n)
+        assert dictrslt['strgtarg'] == 'Target%d' % n
+        for name in ['boolcalclspe', 'boolsrchboxsperi', 'boolsrchoutlperi', 'dictfeat', 'timeexec', 'dicttimestag', 'boolplot']:
+            assert dictrslt[name] == dictrsltinpt[name]
+        assert dictrslt['boolposi'].dtype == bool
+        assert np.array_equal(dictrslt['boolposi'], dictrsltinpt['boolposi'])
+        assert ('dicttria' in dictrslt) == (n == 1)
+    assert listdictrslt[2]['dicttria'] == {'s2nrtria': 3., 'duratria': 0.5}
+
+    # records of a different target list are ignored
+    gdat.strgtarg = np.array(['Target0', 'Other1', 'Target2'])
+    gdat.numbtarg = gdat.strgtarg.size
+    assert [dictrslt['indxtarg'] for dictrslt in troia.main.read_ledgtarg(gdat, gdat.pathledgtarg)] == [0]
+
+
+def test_trun_ledgtarg(tmp_path):
+
+    gdat = types.SimpleNamespace()
+    gdat.strgtarg = np.array(['Target%d' % n for n in range(5)])
+    gdat.numbtarg = gdat.strgtarg.size
+    gdat.pathledgtarg = str(tmp_path) + '/Ledger.jsonl'
+
+    troia.main.writ_ledgtarg(gdat, retr_dictrslt(0))
+    with open(gdat.pathledgtarg, 'a') as objtfile:
+        objtfile.write('{"indxtarg": 4, "strgtarg": "Tar')
+
+    # the records appended by a rerun are read back after the truncated line has been removed
+    troia.main.trun_ledgtarg(gdat.pathledgtarg)
+    troia.main.writ_ledgtarg(gdat, retr_dictrslt(4))
+    assert [dictrslt['indxtarg'] for dictrslt in troia.main.read_ledgtarg(gdat, gdat.pathledgtarg)] == [0, 4]
@@ -0,0 +1,60 @@
+import types
+
+import numpy as np
+
+import troia.main
+
+
+def test_retr_indxsysttarg():
+
+    objtrand = np.random.default_rng(0)
+    for k in range(20):
+        indxtargrele = np.sort(objtrand.choice(1000, size=objtrand.integers(1, 100), replace=False))
+        indxtargpopl = np.sort(objtrand.choice(indxtargrele, size=objtrand.integers(0, indxtargrele.size + 1), replace=False))
+
+        # loop replaced by the sorted search, which counts the members of the population among the relevant targets
+        indxsystloop = []
+        for n in indxtargrele:
+            if n in indxtargpopl:
+                indxsystloop.append(len(indxsystloop))
+
+        indxsyst, boolpopl = troia.main.retr_indxsysttarg(indxtargpopl, indxtargrele)
+        assert np.array_equal(boolpopl, np.isin(indxtargrele, indxtargpopl))
+        assert np.array_equal(indxsyst[boolpopl], indxsystloop)
+
+
+def test_retr_indxstarbody():
+
+    objtrand = np.random.default_rng(1)
+    for k in range(20):
+        numbstar = objtrand.integers(1, 30)
+        numbbodystar = objtrand.integers(0, 4, size=numbstar)
+        indxbody = objtrand.permutation(np.sum(numbbodystar))
+        listindxbodystar = np.split(indxbody, np.cumsum(numbbodystar)[:-1])
+
+        # nicomedia returns a list or an object array of arrays of companion indices
+        if k % 2 == 0:
+            indxbodystar = listindxbodystar
+        else:
+            indxbodystar = np.empty(numbstar, dtype=object)
+            indxbodystar[:] = [list(indx) for indx in listindxbodystar]
+
+        indxstarbodyloop = np.empty(indxbody.size, dtype=int)
+        for m, indx in enumerate(listindxbodystar):
+            for c in indx:
+                indxstarbodyloop[c] = m
+
+        assert np.array_equal(troia.main.retr_indxstarbody(indxbodystar), indxstarbodyloop)
+
+
+def test_retr_featpopltrue():
+
+    # stars 0 to 3 are targets 10 to 13, the first of which has two companions and the second none
+    indxtargbody = np.arange(10, 14)[troia.main.retr_indxstarbody([[0, 1], [], [2], [3]])]
+
+    gdat = types.SimpleNamespace(dictindxtargpopltrue=dict(), dictindxrowspopltrue=dict())
+    gdat.dictpopltrue = {'All': {'pericomp': [np.array([1., 2., 3., 4.]), '']}}
+    troia.main.setp_indxtargpopltrue(gdat, 'All', indxtargbody)
+
+    feat = troia.main.retr_featpopltrue(gdat, 'All', 'pericomp', np.arange(9, 15))
+    assert np.array_equal(feat, [np.nan, 1., np.nan, 3., 4., np.nan], equal_nan=True)
@@ -0,0 +1,118 @@
+import os, json, threading, types, urllib.parse, http.server, concurrent.futures
+
+import numpy as np
+import pytest
+
+import troia.main
+
+
+class objtstanmast(http.server.BaseHTTPRequestHandler):
+    '''
+    Local stand-in for the MAST API and its file download service
+    '''
+
+    listrequ = []
+
+    def do_POST(self):
+        strgdata = self.rfile.read(int(self.headers['Content-Length'])).decode()
+        dictrequ = json.loads(urllib.parse.parse_qs(strgdata)['request'][0])
+        self.listrequ.append(dictrequ)
+
+        if dictrequ['service'] == 'Mast.Name.Lookup':
+            if dictrequ['params']['input'] == 'Unknown':
+                dictresp = {'resolvedCoordinate': []}
+            else:
+                dictresp = {'resolvedCoordinate': [{'ra': 10., 'decl': -20., 'canonicalName': dictrequ['params']['input'].upper()}]}
+        elif dictrequ['service'] == 'Mast.Caom.Cone':
+            dictresp = {'data': [{'obsid': '1', 'obs_collection': 'TESS', 'dataproduct_type': 'timeseries'}, \
+                                 {'obsid': '2', 'obs_collection': 'TESS', 'dataproduct_type': 'image'}]}
+        elif dictrequ['service'] == 'Mast.Caom.Products':
+            dictresp = {'data': [{'obs_id': 'tess-s0001', 'productFilename': 'tess-s0001_lc.fits', 'dataURI': 'mast:TESS/tess-s0001_lc.fits'}, \
+                                 {'obs_id': 'tess-s0001', 'productFilename': 'tess-s0001_tp.fits', 'dataURI': 'mast:TESS/tess-s0001_tp.fits'}]}
+
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(json.dumps(dictresp).encode())
+
+    def do_GET(self):
+        self.listrequ.append({'service': 'Download', 'uri': urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)['uri'][0]})
+
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'light curve')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def strgurlsstan():
+    objtstanmast.listrequ.clear()
+    objtserv = http.server.ThreadingHTTPServer(('127.0.0.1', 0), objtstanmast)
+    objtthrd = threading.Thread(target=objtserv.serve_forever, daemon=True)
+    objtthrd.start()
+    yield 'http://127.0.0.1:%d/' % objtserv.server_address[1]
+    objtserv.shutdown()
+    objtserv.server_close()
+
+
+def test_retr_dictresomast(strgurlsstan, tmp_path):
+
+    pathcach = str(tmp_path) + '/MAST/'
+    pathstaglcur = str(tmp_path) + '/Stage/'
+    os.makedirs(pathcach)
+
+    dictreso = troia.main.retr_dictresomast('TOI-1233', strgurlsstan + 'invoke', pathcach, \
+                                            strgurlsdownmast=strgurlsstan + 'Download/file', pathstaglcur=pathstaglcur)
+    assert dictreso['rasctarg'] == 10.
+    assert dictreso['decltarg'] == -20.
+    assert dictreso['strgnamecano'] == 'TOI-1233'
+
+    # only the light curve of the time-series observation is staged, in the layout of astroquery and lightkurve
+    assert dictreso['listpathlcur'] == [pathstaglcur + 'mastDownload/TESS/tess-s0001/tess-s0001_lc.fits']
+    with open(dictreso['listpathlcur'][0], 'rb') as objtfile:
+        assert objtfile.read() == b'light curve'
+    assert [dictrequ['service'] for dictrequ in objtstanmast.listrequ] == ['Mast.Name.Lookup', 'Mast.Caom.Cone', 'Mast.Caom.Products', 'Download']
+
+    # a second resolution is read from the cache without any request
+    assert troia.main.retr_dictresomast('TOI-1233', strgurlsstan + 'invoke', pathcach, \
+                                        strgurlsdownmast=strgurlsstan + 'Download/file', pathstaglcur=pathstaglcur) == dictreso
+    assert troia.main.read_dictresomast('TOI-1233', pathcach) == dictreso
+    assert len(objtstanmast.listrequ) == 4
+
+    # names that cannot be resolved are cached without coordinates or light curves
+    dictreso = troia.main.retr_dictresomast('Unknown', strgurlsstan + 'invoke', pathcach, \
+                                            strgurlsdownmast=strgurlsstan + 'Download/file', pathstaglcur=pathstaglcur)
+    assert dictreso['rasctarg'] is None
+    assert not 'listpathlcur' in dictreso
+    assert len(objtstanmast.listrequ) == 5
+
+
+def test_subm_prefmast(strgurlsstan, tmp_path):
+
+    gdat = types.SimpleNamespace()
+    gdat.labltarg = ['Target %d' % n for n in range(10)]
+    gdat.strgurlsmast = strgurlsstan + 'invoke'
+    gdat.strgurlsdownmast = strgurlsstan + 'Download/file'
+    gdat.pathcachmast = str(tmp_path) + '/'
+    gdat.pathstaglcur = None
+    gdat.numbthrdpref = 2
+    gdat.numbtargpref = 3
+    gdat.numbtargdisp = 0
+
+    # the look-ahead window extends numbtargpref targets beyond those dispatched to the analysis
+    indxtargorde = np.array([9, 8, 7, 6, 5, 4, 3, 2, 1, 0])
+    troia.main.strt_prefmast(gdat, indxtargorde)
+    assert gdat.indxtargorderpref == 3
+
+    gdat.numbtargdisp = 4
+    troia.main.subm_prefmast(gdat)
+    assert gdat.indxtargorderpref == 7
+
+    concurrent.futures.wait(gdat.listfutupref)
+    troia.main.stop_prefmast(gdat)
+
+    for n in indxtargorde[:7]:
+        assert troia.main.read_dictresomast(gdat.labltarg[n], gdat.pathcachmast)['rasctarg'] == 10.
+    for n in indxtargorde[7:]:
+        assert troia.main.read_dictresomast(gdat.labltarg[n], gdat.pathcachmast) is None
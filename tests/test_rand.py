@@ -0,0 +1,38 @@
+import types, concurrent.futures, multiprocessing
+
+import numpy as np
+
+import troia.main
+
+
+def retr_drawtarg(gdat, namestag, n):
+
+    return troia.main.retr_objtrand(gdat, namestag, n).random(5), troia.main.retr_seedglob(gdat, namestag, n)
+
+
+def test_retr_objtrand():
+
+    gdat = types.SimpleNamespace(seedrand=42)
+    indxtarg = np.arange(20)
+
+    dictdraw = {n: retr_drawtarg(gdat, 'anls', n) for n in indxtarg}
+
+    # the draws of a target do not depend on the order in which targets are processed
+    for n in np.random.default_rng(0).permutation(indxtarg):
+        drawtarg, seedglob = retr_drawtarg(gdat, 'anls', n)
+        assert np.array_equal(drawtarg, dictdraw[n][0])
+        assert seedglob == dictdraw[n][1]
+
+    # nor on the process in which they are processed
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as objtpool:
+        listfutu = {n: objtpool.submit(retr_drawtarg, gdat, 'anls', n) for n in indxtarg[::-1]}
+        for n, objtfutu in listfutu.items():
+            drawtarg, seedglob = objtfutu.result()
+            assert np.array_equal(drawtarg, dictdraw[n][0])
+            assert seedglob == dictdraw[n][1]
+
+    # targets, stages, and runs have different streams
+    assert len(set(dictdraw[n][0][0] for n in indxtarg)) == indxtarg.size
+    assert len(set(dictdraw[n][1] for n in indxtarg)) == indxtarg.size
+    assert not np.array_equal(retr_drawtarg(gdat, 'tria', 0)[0], dictdraw[0][0])
+    assert not np.array_equal(retr_drawtarg(types.SimpleNamespace(seedrand=43), 'anls', 0)[0], dictdraw[0][0])
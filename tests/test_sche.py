@@ -0,0 +1,50 @@
+import numpy as np
+
+import troia.main
+
+
+def test_retr_listindxtargwork():
+
+    objtrand = np.random.default_rng(0)
+    for k in range(20):
+        numbtarg = objtrand.integers(1, 200)
+        timeexecexpc = objtrand.lognormal(3., 1.5, size=numbtarg + 10)
+        indxtarg = np.sort(objtrand.choice(numbtarg + 10, size=numbtarg, replace=False))
+
+        listindxtargwork = troia.main.retr_listindxtargwork(indxtarg, timeexecexpc, 4, numbtargchunmaxi=4, timechunmaxi=300.)
+
+        # every target is dispatched exactly once
+        indxtargwork = np.concatenate(listindxtargwork)
+        assert np.array_equal(np.sort(indxtargwork), indxtarg)
+
+        # longest-expected-first
+        assert np.all(np.diff(timeexecexpc[indxtargwork]) <= 0.)
+
+        # chunks are capped in size and in expected execution time, unless they have a single target
+        for indxtargchun in listindxtargwork:
+            assert 1 <= indxtargchun.size <= 4
+            assert indxtargchun.size == 1 or np.sum(timeexecexpc[indxtargchun]) <= 300.
+
+
+def test_retr_listindxtargwork_prio():
+
+    objtrand = np.random.default_rng(1)
+    for k in range(20):
+        numbtarg = objtrand.integers(1, 200)
+        timeexecexpc = objtrand.lognormal(3., 1.5, size=numbtarg + 10)
+        # ties in priority keep the order of the targets
+        prio = objtrand.integers(0, 5, size=numbtarg + 10).astype(float)
+        indxtarg = np.sort(objtrand.choice(numbtarg + 10, size=numbtarg, replace=False))
+
+        listindxtargwork = troia.main.retr_listindxtargwork(indxtarg, timeexecexpc, 4, numbtargchunmaxi=3, prio=prio)
+
+        indxtargwork = np.concatenate(listindxtargwork)
+        assert np.array_equal(np.sort(indxtargwork), indxtarg)
+
+        # highest-priority-first, regardless of the expected execution time
+        assert np.all(np.diff(prio[indxtargwork]) <= 0.)
+        for p in np.unique(prio[indxtarg]):
+            assert np.all(np.diff(indxtargwork[prio[indxtargwork] == p]) > 0)
+        
+        for indxtargchun in listindxtargwork:
+            assert 1 <= indxtargchun.size <= 3
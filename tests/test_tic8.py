@@ -0,0 +1,42 @@
+import os, sys, types
+
+import numpy as np
+import pytest
+
+import troia.main
+
+
+@pytest.fixture
+def listtypepopl(monkeypatch):
+    # local stand-in for nicomedia, which records the TIC8 populations it is asked for
+    listtypepopl = []
+    def retr_dictpopltic8(typepopl):
+        listtypepopl.append(typepopl)
+        return {'tmag': np.array([8., 9., 10.]), 'radistar': np.array([1., 0.5, 2.]), 'strgtarg': np.array(['A', 'B', 'C'], dtype=object)}
+    monkeypatch.setitem(sys.modules, 'nicomedia', types.SimpleNamespace(retr_dictpopltic8=retr_dictpopltic8))
+    return listtypepopl
+
+
+def test_retr_dicttic8(listtypepopl, tmp_path):
+
+    pathcach = str(tmp_path) + '/'
+
+    # the remains of an interrupted conversion, without the completion marker, are not read
+    os.makedirs(pathcach + 'TIC8_CTL/')
+    with open(pathcach + 'TIC8_CTL/List_Columns.json', 'w') as objtfile:
+        objtfile.write('["tmag", "radi')
+
+    dicttic8 = troia.main.retr_dicttic8('CTL', pathcach)
+    assert listtypepopl == ['CTL']
+    assert sorted(dicttic8.keys()) == ['radistar', 'tmag']
+    assert np.array_equal(dicttic8['tmag'], [8., 9., 10.])
+    assert isinstance(dicttic8['tmag'], np.memmap)
+    assert os.path.exists(pathcach + 'TIC8_CTL/Complete.txt')
+
+    # no temporary folder is left behind
+    assert sorted(os.listdir(pathcach)) == ['TIC8_CTL']
+
+    # the completed conversion is reused without nicomedia
+    dicttic8 = troia.main.retr_dicttic8('CTL', pathcach)
+    assert listtypepopl == ['CTL']
+    assert np.array_equal(dicttic8['radistar'], [1., 0.5, 2.])
@@ -0,0 +1,60 @@
+import numpy as np
+
+import troia.main
+
+
+def retr_arrytser(objtrand, stdv=1e-3):
+
+    # 27 days at a cadence of 2 minutes
+    time = np.arange(0., 27., 2. / 60. / 24.)
+    flux = 1. + stdv * objtrand.standard_normal(time.size)
+
+    return np.stack([time, flux], axis=1)
+
+
+def test_retr_dicttria_stdv():
+
+    stdv = 1e-3
+    arrytser = retr_arrytser(np.random.default_rng(0), stdv=stdv)
+
+    dicttria = troia.main.retr_dicttria(arrytser, [0.1, 0.5, 2.])
+    assert abs(dicttria['stdvtria'] / stdv - 1.) < 0.05
+    assert dicttria['numboutlposi'] == 0
+    assert dicttria['numboutlnega'] == 0
+
+    # pure noise does not pass the triage
+    assert dicttria['s2nrtria'] < 5.
+
+
+def test_retr_dicttria_outl():
+
+    stdv = 1e-3
+    arrytser = retr_arrytser(np.random.default_rng(1), stdv=stdv)
+    arrytser[1000:7000:1000, 1] += 10. * stdv
+    arrytser[15000:18000:1000, 1] -= 10. * stdv
+
+    # the scatter is robust to outliers
+    dicttria = troia.main.retr_dicttria(arrytser, [0.1, 0.5, 2.])
+    assert abs(dicttria['stdvtria'] / stdv - 1.) < 0.05
+    assert dicttria['numboutlposi'] == 6
+    assert dicttria['numboutlnega'] == 3
+
+
+def test_retr_dicttria_s2nr():
+
+    stdv = 1e-3
+    arrytser = retr_arrytser(np.random.default_rng(2), stdv=stdv)
+
+    # brightening of half a day at half the scatter, whose expected signal-to-noise ratio is 0.5 sqrt(360) = 9.5
+    indxtimesign = np.where((arrytser[:, 0] > 10.) & (arrytser[:, 0] < 10.5))[0]
+    arrytser[indxtimesign, 1] += 0.5 * stdv
+
+    dicttria = troia.main.retr_dicttria(arrytser, [0.1, 0.5, 2.])
+    assert dicttria['duratria'] == 0.5
+    assert abs(dicttria['s2nrtria'] - 0.5 * np.sqrt(indxtimesign.size)) < 2.
+
+    # the order of the samples and missing fluxes do not matter
+    arrytser[::7, 1] = np.nan
+    dicttriaperm = troia.main.retr_dicttria(np.random.default_rng(3).permutation(arrytser), [0.1, 0.5, 2.])
+    assert dicttriaperm['duratria'] == 0.5
+    assert abs(dicttriaperm['s2nrtria'] - dicttria['s2nrtria']) < 1.
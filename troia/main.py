@@ -1,228 +1,1792 @@
-import os, sys, datetime, copy
+import os, sys, shutil, datetime, time, json, collections, copy, queue, zlib, tracemalloc, logging
 
-import matplotlib
-matplotlib.use('agg')
-import matplotlib.pyplot as plt
+import numpy as np
+
+# heavy dependencies (matplotlib, tdpy, ephesos, miletos, pergamon, nicomedia, and chalcedon) are imported 
+# by the functions that need them, so that importing troia and starting worker processes is fast
+
+# logger of troia, whose level is set by the type of verbosity
+logg = logging.getLogger('troia')
+
+
+def setp_logg(typeverb, timerate=60.):
+    '''
+    Set the level of the logger based on the type of verbosity and rate-limit the messages repeated for each target
+    
+    Arguments
+        typeverb: type of verbosity (-1: no text, 0: only warnings, 1: information, 2: debugging)
+        timerate: minimum time between two messages logged with extra={'boolrate': True} with the same template [s]
+    '''
+    
+    if typeverb < 0:
+        logg.setLevel(logging.CRITICAL + 1)
+    elif typeverb == 0:
+        logg.setLevel(logging.WARNING)
+    elif typeverb == 1:
+        logg.setLevel(logging.INFO)
+    else:
+        logg.setLevel(logging.DEBUG)
+    
+    logg.propagate = False
+    if len(logg.handlers) == 0:
+        objthand = logging.StreamHandler(sys.stdout)
+        objthand.setFormatter(logging.Formatter('%(message)s'))
+        logg.addHandler(objthand)
+    
+    # time of the last message and number of suppressed messages for each template of rate-limited messages
+    dictrate = dict()
+    def filt_rate(record):
+        if not getattr(record, 'boolrate', False):
+            return True
+        strgtmpt = record.msg
+        timelast, numbsupp = dictrate.get(strgtmpt, (-np.inf, 0))
+        if record.created - timelast < timerate:
+            dictrate[strgtmpt] = (timelast, numbsupp + 1)
+            return False
+        dictrate[strgtmpt] = (record.created, 0)
+        if numbsupp > 0:
+            record.msg = record.getMessage() + ' (%d similar messages suppressed)' % numbsupp
+            record.args = None
+        return True
+    
+    for filt in list(logg.filters):
+        logg.removeFilter(filt)
+    logg.addFilter(filt_rate)
+
+
+def retr_dictderi_effe(para, gdat):
+    
+    dictparaderi, dictvarbderi = retr_dictderi_effesamp(np.asarray(para)[None, :], gdat)
+
+    return dictparaderi, dictvarbderi
+    
+
+def retr_dictderi_effesamp(listpara, gdat):
+    '''
+    Return the derived parameters of a self-lensing binary for all samples of a posterior chain at once
+    
+    Arguments
+        listpara: array of shape (numbsamp, numbpara) of the parameters radistar, peri, masscomp, massstar, and optionally incl [deg], 
+                  which is 90 degrees (edge-on) if not provided
+    '''
+    
+    import ephesos
+    import chalcedon
+    
+    listpara = np.asarray(listpara, dtype=float)
+    
+    radistar = listpara[:, 0]
+    peri = listpara[:, 1]
+    masscomp = listpara[:, 2]
+    massstar = listpara[:, 3]
+    if listpara.shape[1] > 4:
+        incl = listpara[:, 4]
+    else:
+        incl = np.full(listpara.shape[0], 90.)
+    masstotl = massstar + masscomp
+
+    amplslenmodl = chalcedon.retr_amplslen(peri, radistar, masscomp, massstar)
+    duratrantotlmodl = ephesos.retr_duratrantotl(peri, radistar, masscomp, massstar, incl)
+    smax = ephesos.retr_smaxkepl(peri, masstotl) * 215. # [R_S]
+    radischw = 4.24e-6 * masscomp # [R_S]
+
+    dictvarbderi = None
+
+    dictparaderi = dict()
+    dictparaderi['amplslenmodl'] = np.broadcast_to(amplslenmodl, radistar.shape).astype(float)
+    dictparaderi['duratrantotlmodl'] = np.broadcast_to(duratrantotlmodl, radistar.shape).astype(float)
+    dictparaderi['smaxmodl'] = np.broadcast_to(smax, radistar.shape).astype(float)
+    dictparaderi['radischw'] = radischw
+
+    return dictparaderi, dictvarbderi
+    
+
+def retr_seedsequ(seedrand, namestag, n=0):
+    '''
+    Return the seed sequence of a stage of the run and of a target, which depends only on the seed of the run, the name of the stage, 
+    and the index of the target, but not on the order, process, or node, in which the work is done
+    '''
+    
+    return np.random.SeedSequence(entropy=seedrand, spawn_key=(zlib.crc32(namestag.encode()), int(n)))
+
+
+def retr_objtrand(gdat, namestag, n=0):
+    '''
+    Return an independent random number generator for a stage of the run and a target
+    '''
+    
+    return np.random.default_rng(retr_seedsequ(gdat.seedrand, namestag, n))
+
+
+def retr_seedglob(gdat, namestag, n=0):
+    '''
+    Return a seed of the global random state of numpy for a stage of the run and a target, used by the dependencies that draw from it
+    '''
+    
+    return int(retr_seedsequ(gdat.seedrand, namestag, n).generate_state(1)[0])
+
+
+def retr_objtjson(objt):
+    '''
+    Convert an object that json cannot serialize into one that it can, or raise an exception if there is no conversion that is stable 
+    across runs
+    '''
+    
+    if isinstance(objt, np.ndarray):
+        return objt.tolist()
+    if isinstance(objt, np.generic):
+        return objt.item()
+    raise TypeError('Object of type %s cannot be serialized into a stable fingerprint.' % type(objt).__name__)
+
+
+def retr_strghash(objt):
+    '''
+    Return a hash string of a (nested) dictionary of inputs, independent of the order of its keys
+    '''
+    
+    import hashlib
+
+    strg = json.dumps(objt, sort_keys=True, default=retr_objtjson)
+    
+    return hashlib.sha1(strg.encode()).hexdigest()[:16]
+
+
+def retr_dictpoplstarcompclas(nameclastruetype, numbsyst, seedclas, dictpoplsystinpt, pathcach):
+    '''
+    Generate the synthetic population of a class of systems, or read it from the disk cache if it has been generated before with the same inputs
+    '''
+    
+    import pickle
+    import nicomedia
+
+    if pathcach is not None:
+        # the version of nicomedia is part of the hash so that populations generated by an earlier version are not reused
+        strghash = retr_strghash([nameclastruetype, numbsyst, seedclas, dictpoplsystinpt, getattr(nicomedia, '__version__', None)])
+        path = pathcach + 'Population_%s_%s.pickle' % (nameclastruetype, strghash)
+        if os.path.exists(path):
+            logg.info('Reading the population of %s from %s...', nameclastruetype, path)
+            with open(path, 'rb') as objtfile:
+                return pickle.load(objtfile)
+    
+    # each class has its own seed so that the population does not depend on the order or process in which classes are generated
+    np.random.seed(seedclas)
+    dictpopl = nicomedia.retr_dictpoplstarcomp(nameclastruetype, numbsyst=numbsyst, **dictpoplsystinpt)
+    
+    if pathcach is not None:
+        logg.info('Writing the population of %s to %s...', nameclastruetype, path)
+        # write to a temporary file first so that concurrent runs never read a partially written population
+        pathtemp = path + '.%d.temp' % os.getpid()
+        with open(pathtemp, 'wb') as objtfile:
+            pickle.dump(dictpopl, objtfile, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(pathtemp, path)
+
+    return dictpopl
+
+
+def retr_dicttic8(typepopl, pathcach):
+    '''
+    Return the TIC8 population as a dictionary of read-only, memory-mapped columns
+    
+    The population is converted from nicomedia into one .npy file per column the first time it is requested, so that later runs 
+    open it in constant time and only read the parts of the columns that are accessed. The conversion is written into a temporary 
+    folder, which is moved into place once a completion marker has been written into it, so that an interrupted or concurrent conversion 
+    is never read.
+    '''
+    
+    pathtic8 = pathcach + 'TIC8_%s/' % typepopl
+    pathlistnamecols = pathtic8 + 'List_Columns.json'
+    pathcomp = pathtic8 + 'Complete.txt'
+    
+    if not os.path.exists(pathcomp):
+        import nicomedia
+        
+        logg.info('Converting the TIC8 population %s into memory-mapped columns in %s...', typepopl, pathtic8)
+        dicttic8 = nicomedia.retr_dictpopltic8(typepopl=typepopl)
+        
+        pathtemp = pathcach + 'TIC8_%s_%d.temp/' % (typepopl, os.getpid())
+        if os.path.exists(pathtemp):
+            shutil.rmtree(pathtemp)
+        os.makedirs(pathtemp)
+        listnamecols = []
+        for namecols, valu in dicttic8.items():
+            valu = np.asarray(valu)
+            if valu.dtype == object or valu.ndim != 1:
+                logg.warning('Skipping the column %s of the TIC8 population, which cannot be memory-mapped.', namecols)
+                continue
+            arry = np.lib.format.open_memmap(pathtemp + '%s.npy' % namecols, mode='w+', dtype=valu.dtype, shape=valu.shape)
+            arry[:] = valu
+            arry.flush()
+            del arry
+            listnamecols.append(namecols)
+        with open(pathtemp + 'List_Columns.json', 'w') as objtfile:
+            json.dump(listnamecols, objtfile)
+        with open(pathtemp + 'Complete.txt', 'w') as objtfile:
+            objtfile.write('%d\n' % len(listnamecols))
+        del dicttic8
+        
+        # remove the remains of an interrupted conversion, unless a concurrent run has completed its conversion in the meantime
+        if os.path.exists(pathtic8) and not os.path.exists(pathcomp):
+            shutil.rmtree(pathtic8, ignore_errors=True)
+        try:
+            os.replace(pathtemp, pathtic8)
+        except OSError:
+            if not os.path.exists(pathcomp):
+                raise
+        if os.path.exists(pathtemp):
+            shutil.rmtree(pathtemp)
+    
+    with open(pathlistnamecols, 'r') as objtfile:
+        listnamecols = json.load(objtfile)
+    
+    dicttic8 = dict()
+    for namecols in listnamecols:
+        dicttic8[namecols] = np.load(pathtic8 + '%s.npy' % namecols, mmap_mode='r')
+    
+    return dicttic8
+
+
+def retr_pathresomast(strgqmast, pathcach):
+    '''
+    Return the path of the cached MAST resolution of a target name
+    '''
+    
+    strgfile = ''.join([strg if strg.isalnum() else '_' for strg in strgqmast])
+    
+    return pathcach + 'Resolution_%s_%08x.json' % (strgfile, zlib.crc32(strgqmast.encode()))
+
+
+def read_dictresomast(strgqmast, pathcach):
+    '''
+    Read the cached MAST resolution of a target name without any network access, or return None if it has not been prefetched
+    '''
+    
+    path = retr_pathresomast(strgqmast, pathcach)
+    if not os.path.exists(path):
+        return None
+    
+    with open(path, 'r') as objtfile:
+        return json.load(objtfile)
+
+
+def retr_dictrespmast(dictrequ, strgurlsmast, timeoutt=60.):
+    '''
+    Send a request to the MAST API and return its decoded JSON response
+    '''
+    
+    import urllib.request, urllib.parse
+    
+    strgdata = urllib.parse.urlencode({'request': json.dumps(dictrequ)}).encode()
+    with urllib.request.urlopen(strgurlsmast, data=strgdata, timeout=timeoutt) as objtresp:
+        return json.loads(objtresp.read().decode())
+
+
+def writ_dictresomast(dictreso, pathcach):
+    '''
+    Write the MAST resolution of a target name to the cache
+    '''
+    
+    # write to a temporary file first so that workers never read a partially written resolution
+    path = retr_pathresomast(dictreso['strgqmast'], pathcach)
+    pathtemp = path + '.%d.%d.temp' % (os.getpid(), id(dictreso))
+    with open(pathtemp, 'w') as objtfile:
+        json.dump(dictreso, objtfile)
+    os.replace(pathtemp, path)
+
+
+def retr_listpathlcurmast(rasctarg, decltarg, strgurlsmast, strgurlsdownmast, pathstaglcur, timeoutt=60.):
+    '''
+    Stage the TESS light-curve files of a target from MAST on disk and return their paths
+    
+    Files are written under pathstaglcur in the mastDownload/<collection>/<obs_id>/ layout of astroquery and lightkurve, so that 
+    the retrieval of light curves by miletos finds them on disk. Files that are already staged are not downloaded again.
+    '''
+    
+    import urllib.request, urllib.parse
+    
+    # time-series observations of TESS at the position of the target
+    dictrequ = {'service': 'Mast.Caom.Cone', 'params': {'ra': rasctarg, 'dec': decltarg, 'radius': 2. / 3600.}, 'format': 'json'}
+    listdictobsv = [dictobsv for dictobsv in retr_dictrespmast(dictrequ, strgurlsmast, timeoutt=timeoutt).get('data', []) \
+                                            if dictobsv.get('obs_collection') == 'TESS' and dictobsv.get('dataproduct_type') == 'timeseries']
+    
+    listpathlcur = []
+    for dictobsv in listdictobsv:
+        dictrequ = {'service': 'Mast.Caom.Products', 'params': {'obsid': dictobsv['obsid']}, 'format': 'json'}
+        for dictprod in retr_dictrespmast(dictrequ, strgurlsmast, timeoutt=timeoutt).get('data', []):
+            if not dictprod['productFilename'].endswith('_lc.fits'):
+                continue
+            
+            pathdire = pathstaglcur + 'mastDownload/%s/%s/' % (dictobsv['obs_collection'], dictprod['obs_id'])
+            path = pathdire + dictprod['productFilename']
+            if not os.path.exists(path):
+                os.makedirs(pathdire, exist_ok=True)
+                strgurls = strgurlsdownmast + '?' + urllib.parse.urlencode({'uri': dictprod['dataURI']})
+                pathtemp = path + '.%d.%d.temp' % (os.getpid(), id(dictprod))
+                with urllib.request.urlopen(strgurls, timeout=timeoutt) as objtresp, open(pathtemp, 'wb') as objtfile:
+                    objtfile.write(objtresp.read())
+                os.replace(pathtemp, path)
+            listpathlcur.append(path)
+    
+    return listpathlcur
+
+
+def retr_dictresomast(strgqmast, strgurlsmast, pathcach, strgurlsdownmast=None, pathstaglcur=None, timeoutt=60.):
+    '''
+    Resolve a target name (e.g., a MAST keyword, TOI, or TIC ID) into coordinates via the name lookup service of MAST, 
+    using the on-disk cache if the name has been resolved before, and stage its light-curve files if pathstaglcur is given
+    
+    Arguments
+        strgqmast: name of the target to be resolved
+        strgurlsmast: URL of the MAST API, which can point to a local stand-in server
+        pathcach: path of the cache of resolutions
+        strgurlsdownmast: URL of the file download service of MAST
+        pathstaglcur: path, under which light-curve files are staged, or None to not stage them
+    
+    Returns a dictionary with the right ascension (rasctarg) and declination (decltarg) of the target, which are None if the name 
+    could not be resolved, and the paths of the staged light-curve files (listpathlcur) if they have been staged.
+    '''
+    
+    dictreso = read_dictresomast(strgqmast, pathcach)
+    if dictreso is None:
+        dictrequ = {'service': 'Mast.Name.Lookup', 'params': {'input': strgqmast, 'format': 'json'}}
+        dictresp = retr_dictrespmast(dictrequ, strgurlsmast, timeoutt=timeoutt)
+        
+        dictreso = dict()
+        dictreso['strgqmast'] = strgqmast
+        if len(dictresp.get('resolvedCoordinate', [])) > 0:
+            dictreso['rasctarg'] = dictresp['resolvedCoordinate'][0]['ra']
+            dictreso['decltarg'] = dictresp['resolvedCoordinate'][0]['decl']
+            dictreso['strgnamecano'] = dictresp['resolvedCoordinate'][0].get('canonicalName', None)
+        else:
+            dictreso['rasctarg'] = None
+            dictreso['decltarg'] = None
+            dictreso['strgnamecano'] = None
+        
+        writ_dictresomast(dictreso, pathcach)
+    
+    if pathstaglcur is not None and dictreso['rasctarg'] is not None and not 'listpathlcur' in dictreso:
+        dictreso['listpathlcur'] = retr_listpathlcurmast(dictreso['rasctarg'], dictreso['decltarg'], strgurlsmast, strgurlsdownmast, \
+                                                                                                            pathstaglcur, timeoutt=timeoutt)
+        writ_dictresomast(dictreso, pathcach)
+
+    return dictreso
+
+
+def strt_prefmast(gdat, indxtargorde):
+    '''
+    Start the concurrent prefetch of the MAST resolutions and light-curve files of the targets in the order in which they are dispatched
+    '''
+    
+    import concurrent.futures
+    
+    gdat.objtpoolpref = concurrent.futures.ThreadPoolExecutor(max_workers=gdat.numbthrdpref)
+    gdat.indxtargorde = indxtargorde
+    gdat.indxtargorderpref = 0
+    gdat.listfutupref = []
+    
+    subm_prefmast(gdat)
+
+
+def subm_prefmast(gdat):
+    '''
+    Submit prefetches of upcoming targets up to the look-ahead window beyond the targets dispatched to the analysis
+    '''
+    
+    while gdat.indxtargorderpref < gdat.indxtargorde.size and gdat.indxtargorderpref < gdat.numbtargdisp + gdat.numbtargpref:
+        n = gdat.indxtargorde[gdat.indxtargorderpref]
+        gdat.listfutupref.append(gdat.objtpoolpref.submit(retr_dictresomast, gdat.labltarg[n], gdat.strgurlsmast, gdat.pathcachmast, \
+                                                                strgurlsdownmast=gdat.strgurlsdownmast, pathstaglcur=gdat.pathstaglcur))
+        gdat.indxtargorderpref += 1
+    
+    # report the failed prefetches, whose targets are left to be resolved by miletos
+    listfututemp = []
+    for futupref in gdat.listfutupref:
+        if not futupref.done():
+            listfututemp.append(futupref)
+        elif futupref.exception() is not None:
+            logg.warning('Prefetch from MAST failed: %s', futupref.exception(), extra={'boolrate': True})
+    gdat.listfutupref = listfututemp
+
+
+def stop_prefmast(gdat):
+    '''
+    Stop the prefetch stage, cancelling the prefetches that have not started
+    '''
+    
+    gdat.objtpoolpref.shutdown(wait=True, cancel_futures=True)
+    del gdat.objtpoolpref, gdat.listfutupref
+
+
+def retr_listindxtargwork(indxtarg, timeexecexpc, numbproc, factchun=4., numbtargchunmaxi=4, timechunmaxi=300., prio=None):
+    '''
+    Return the chunks of target indices to be dispatched to the worker pool
+    
+    Targets are ordered longest-expected-first and grouped into chunks whose expected execution time is a fraction 1 / (factchun * numbproc) 
+    of the remaining work, so that chunks shrink towards the end of the run. Chunks are capped at numbtargchunmaxi targets and an expected 
+    execution time of timechunmaxi seconds, so that results, progress, and the ledger are updated frequently.
+    
+    If prio is given, targets are ordered highest-priority-first and grouped into chunks of numbtargchunmaxi targets, so that they are 
+    dispatched in the order of priority.
+    '''
+    
+    numbtarg = indxtarg.size
+    
+    if prio is not None:
+        indxtargsort = indxtarg[np.argsort(-prio[indxtarg], kind='stable')]
+        return [indxtargsort[k:k+numbtargchunmaxi] for k in range(0, numbtarg, numbtargchunmaxi)]
+    
+    # order the targets longest-expected-first
+    indxtargsort = indxtarg[np.argsort(-timeexecexpc[indxtarg], kind='stable')]
+    
+    # cumulative expected execution time
+    timecumu = np.cumsum(timeexecexpc[indxtargsort])
+    timetotl = timecumu[-1]
+    
+    listindxtargwork = []
+    k = 0
+    while k < numbtarg:
+        timedone = timecumu[k-1] if k > 0 else 0.
+        timechun = min((timetotl - timedone) / (factchun * numbproc), timechunmaxi)
+        kend = max(k + 1, np.searchsorted(timecumu, timedone + timechun, side='right'))
+        kend = min(kend, k + numbtargchunmaxi)
+        listindxtargwork.append(indxtargsort[k:kend])
+        k = kend
+
+    return listindxtargwork
+
+
+def retr_listindxcompstar(indxcompstar, indxstar):
+    '''
+    Return the indices of the companions of each of a set of stars in a simulated population
+    
+    Arguments
+        indxcompstar: indices of the companions of each star, as returned by nicomedia in dictindx['comp']['star'], which is a list or 
+                      an object array with an array of companion indices per star
+        indxstar: array of star indices
+    '''
+    
+    return [np.asarray(indxcompstar[k], dtype=int).ravel() for k in indxstar]
+
+
+def writ_arrytruetarg(gdat):
+    '''
+    Gather the true features of the simulated system of each target into per-target arrays, and write them to memory-mapped files, 
+    which worker processes read instead of receiving the simulated populations
+    
+    Features of the stars have one value per target. Features of the companions, of which a star can have several, are concatenated 
+    over the targets, and the offsets of the companions of each target are written to indxcompoffs.npy.
+    '''
+    
+    gdat.pathtruetarg = gdat.pathdatashrd + 'True_Targets/'
+    os.system('mkdir -p %s' % gdat.pathtruetarg)
+    
+    gdat.listnamefeattruetarg = []
+    gdat.listnamefeattruetargcomp = []
+    gdat.dictarrytruetarg = dict()
+    
+    # the miletos input of simulated targets is so far only defined for planetary systems
+    if not 'PlanetarySystem' in gdat.dicttroy['true']:
+        return
+    
+    dictpopltruestar = gdat.dicttroy['true']['PlanetarySystem']['dictpopl']['star'][gdat.namepoplstartotl]
+    dictpopltruecomp = gdat.dicttroy['true']['PlanetarySystem']['dictpopl']['comp'][gdat.namepoplcomptotl]
+    
+    # indices of the stars of the targets, which are left as NaN for targets outside the population
+    indxstartarg, booltargstar = retr_indxsysttarg(gdat.dictindxtarg['PlanetarySystem'], gdat.indxtarg)
+    
+    # indices of the companions of each target, which has none if it is outside the population
+    listindxcomptarg = [np.empty(0, dtype=int) for n in gdat.indxtarg]
+    for n, indxcomp in zip(np.where(booltargstar)[0], \
+                          retr_listindxcompstar(gdat.dicttroy['true']['PlanetarySystem']['dictindx']['comp']['star'], indxstartarg[booltargstar])):
+        listindxcomptarg[n] = indxcomp
+    indxcompoffs = np.concatenate([[0], np.cumsum([indxcomp.size for indxcomp in listindxcomptarg])])
+    indxcomptarg = np.concatenate(listindxcomptarg)
+    
+    dictarrytruetarg = dict()
+    for namepara in gdat.dicttroy['true']['PlanetarySystem']['listnamefeatbody']:
+        arry = np.full(gdat.numbtarg, np.nan)
+        arry[booltargstar] = dictpopltruestar[namepara][0][indxstartarg[booltargstar]]
+        dictarrytruetarg[namepara] = arry
+        gdat.listnamefeattruetarg.append(namepara)
+    for namepara in gdat.dicttroy['true']['PlanetarySystem']['listnamefeatlimbonly']:
+        dictarrytruetarg[namepara] = dictpopltruecomp[namepara][0][indxcomptarg]
+        gdat.listnamefeattruetargcomp.append(namepara)
+    dictarrytruetarg['indxcompoffs'] = indxcompoffs
+    
+    for namepara, arry in dictarrytruetarg.items():
+        np.save(gdat.pathtruetarg + '%s.npy' % namepara, arry)
+    
+    gdat.dictarrytruetarg = read_arrytruetarg(gdat.pathtruetarg, gdat.listnamefeattruetarg + gdat.listnamefeattruetargcomp)
+
+
+def read_arrytruetarg(pathtruetarg, listnamefeattruetarg):
+    '''
+    Open the per-target arrays of true features and the offsets of the companions of each target in read-only mode without loading them 
+    into memory
+    '''
+    
+    dictarrytruetarg = dict()
+    if len(listnamefeattruetarg) == 0:
+        return dictarrytruetarg
+
+    for namepara in listnamefeattruetarg + ['indxcompoffs']:
+        dictarrytruetarg[namepara] = np.load(pathtruetarg + '%s.npy' % namepara, mmap_mode='r')
+    
+    return dictarrytruetarg
+
+
+def retr_gdatwork(gdat):
+    '''
+    Return a lightweight global object for the worker processes of the target pool, which holds the shared miletos input and the 
+    per-target identifiers, but not the simulated populations or the arrays of results, whose sizes grow with the population
+    '''
+    
+    import tdpy
+    
+    listattrwork = ['typepopl', 'labltarg', 'strgtarg', 'liststrgmast', 'listtoiitarg', 'booldataobsv', 'dictmileinptglob', 'boolplotmile', \
+                    'boolsimusome', 'numbtarganimtrue', 'indxdatatser', 'listlablinst', 'numbtargplot', 'typemile', \
+                    'typeverb', 'pathtruetarg', 'listnamefeattruetarg', 'listnamefeattruetargcomp', 'boolprefmast', 'pathcachmast', 'seedrand', 'boolcachmile', \
+                    'pathcachmile', 'booltria', 'thrstria', 'listduratria']
+    
+    gdatwork = tdpy.gdatstrt()
+    for attr in listattrwork:
+        if hasattr(gdat, attr):
+            setattr(gdatwork, attr, getattr(gdat, attr))
+    
+    return gdatwork
+
+
+def init_work(gdat):
+    '''
+    Initialize a worker process of the target pool by keeping a single copy of the lightweight global object
+    '''
+    
+    global gdatwork
+    gdatwork = gdat
+    
+    setp_logg(gdat.typeverb)
+    
+    # true features of the targets are read from memory-mapped files shared by all worker processes
+    if gdat.boolsimusome:
+        gdat.dictarrytruetarg = read_arrytruetarg(gdat.pathtruetarg, gdat.listnamefeattruetarg + gdat.listnamefeattruetargcomp)
+
+
+def proc_work(indxtargwork):
+    '''
+    Process a chunk of targets inside a worker process of the target pool
+    '''
+    
+    return mile_work(gdatwork, indxtargwork)
+
+
+def updt_timestag(dicttimestag, namestag, timewallinit, timecpuuinit):
+    '''
+    Add the wall-clock and CPU times elapsed since the given reference times to a stage and return the current times
+    '''
+    
+    timewall = time.perf_counter()
+    timecpuu = time.process_time()
+    if not namestag in dicttimestag:
+        dicttimestag[namestag] = [0., 0.]
+    dicttimestag[namestag][0] += timewall - timewallinit
+    dicttimestag[namestag][1] += timecpuu - timecpuuinit
+    
+    return timewall, timecpuu
+
+
+def updt_timestagpopl(gdat, namestag, timewallinit, timecpuuinit):
+    '''
+    Add the times elapsed since the given reference times to a stage of the run and return the current times
+    
+    If tracemalloc is tracing, the peak memory allocated during the stage is also recorded.
+    '''
+    
+    if tracemalloc.is_tracing():
+        _, memopeak = tracemalloc.get_traced_memory()
+        if not namestag in gdat.dictmemostagpopl:
+            gdat.dictmemostagpopl[namestag] = 0
+        gdat.dictmemostagpopl[namestag] = max(gdat.dictmemostagpopl[namestag], memopeak)
+        tracemalloc.reset_peak()
+    
+    return updt_timestag(gdat.dicttimestagpopl, namestag, timewallinit, timecpuuinit)
+
+
+def retr_dictmileoutpstub(dictmileinpttarg, objtrand):
+    '''
+    Return a stand-in for the output of miletos with random statistics at negligible cost, used to benchmark the orchestration of troia
+    
+    Arguments
+        objtrand: random number generator of the target
+    '''
+    
+    dictmileoutp = dict()
+    dictmileoutp['boolcalclspe'] = True
+    dictmileoutp['boolsrchboxsperi'] = True
+    dictmileoutp['boolsrchoutlperi'] = True
+    dictmileoutp['perilspempow'] = 10**objtrand.uniform(-1., 1.5)
+    dictmileoutp['powrlspempow'] = objtrand.random()
+    dictmileoutp['dictboxsperioutp'] = dict()
+    dictmileoutp['dictboxsperioutp']['s2nr'] = [objtrand.exponential(5.)]
+    dictmileoutp['dictboxsperioutp']['peri'] = [10**objtrand.uniform(-1., 1.5)]
+    dictmileoutp['dictoutlperi'] = dict()
+    dictmileoutp['dictoutlperi']['minmfrddtimeoutlsort'] = [objtrand.random()]
+    dictmileoutp['boolposianls'] = objtrand.random(6) < 0.5
+
+    return dictmileoutp
+
+
+def retr_dictboolanls(typemile):
+    '''
+    Return the Boolean flags of the analyses, whose outputs are used as features, for a type of per-target analysis
+    '''
+    
+    dictboolanls = dict()
+    if typemile == 'stub':
+        dictboolanls['boolcalclspe'] = True
+        dictboolanls['boolsrchboxsperi'] = True
+        dictboolanls['boolsrchoutlperi'] = True
+    else:
+        dictboolanls['boolcalclspe'] = False
+        dictboolanls['boolsrchboxsperi'] = False
+        dictboolanls['boolsrchoutlperi'] = True
+    
+    return dictboolanls
+
+
+def retr_dictmileoutpnull(dictboolanls):
+    '''
+    Return the output of a target that did not pass the triage, which has undefined features and negative dispositions
+    '''
+    
+    dictmileoutp = dict(dictboolanls)
+    dictmileoutp['perilspempow'] = np.nan
+    dictmileoutp['powrlspempow'] = np.nan
+    dictmileoutp['dictboxsperioutp'] = dict()
+    dictmileoutp['dictboxsperioutp']['s2nr'] = [np.nan]
+    dictmileoutp['dictboxsperioutp']['peri'] = [np.nan]
+    dictmileoutp['dictoutlperi'] = dict()
+    dictmileoutp['dictoutlperi']['minmfrddtimeoutlsort'] = [np.nan]
+    dictmileoutp['boolposianls'] = np.zeros(6, dtype=bool)
+
+    return dictmileoutp
+
+
+def retr_arrytserstub(objtrand):
+    '''
+    Return a stand-in light curve of a sector with white noise and, for a tenth of the targets, a self-lensing pulse
+    '''
+    
+    time = np.arange(0., 27., 2. / 1440.)
+    flux = 1. + 1e-3 * objtrand.standard_normal(time.size)
+    if objtrand.random() < 0.1:
+        timepuls = objtrand.uniform(time[0], time[-1])
+        flux += 10**objtrand.uniform(-4., -2.5) * (abs(time - timepuls) < 2. / 24.)
+    
+    return np.stack([time, flux, np.full(time.size, 1e-3)], axis=1)
+
+
+def retr_arrytsermile(dictmileoutp):
+    '''
+    Return the raw light curves of the instruments in the output of miletos concatenated into a single array of times and fluxes
+    
+    The raw light curves are expected in dictmileoutp['listarrytser']['raww'][0], as a list over instruments of lists over chunks of arrays 
+    of shape (numbtime, 2 or more) or (numbtime, numbener, 2 or more), and an exception is raised if the output of miletos has another layout.
+    '''
+    
+    if not 'listarrytser' in dictmileoutp or not 'raww' in dictmileoutp['listarrytser']:
+        raise Exception('The output of miletos does not have the raw light curves in listarrytser[raww], which the triage needs.')
+    
+    listarrytser = []
+    for arrytserinst in dictmileoutp['listarrytser']['raww'][0]:
+        for arrytser in arrytserinst:
+            arrytser = np.asarray(arrytser)
+            if arrytser.ndim == 3:
+                arrytser = arrytser[:, 0, :]
+            if arrytser.ndim != 2 or arrytser.shape[1] < 2:
+                raise Exception('The raw light curves in the output of miletos have an unexpected shape %s, ' % str(arrytser.shape) + \
+                                                                        'while the triage needs arrays of shape (numbtime, 2 or more).')
+            listarrytser.append(arrytser)
+    
+    if len(listarrytser) == 0:
+        raise Exception('The output of miletos has no raw light curves to triage.')
+
+    return np.concatenate(listarrytser, axis=0)
+
+
+def retr_dicttria(arrytser, listduratria):
+    '''
+    Return the inexpensive statistics of a light curve, used to triage a target before the full analysis
+    
+    Arguments
+        arrytser: array of shape (numbtime, 2 or more) of times [day] and relative fluxes
+        listduratria: durations of the box templates of the self-lensing template bank [day]
+    
+    Returns a dictionary with the robust (median absolute deviation) scatter, the numbers of positive and negative 5-sigma outliers,
+    and the maximum single-event signal-to-noise ratio of a brightening matched to the template bank, along with its duration.
+    '''
+    
+    indx = np.where(np.isfinite(arrytser[:, 0]) & np.isfinite(arrytser[:, 1]))[0]
+    indx = indx[np.argsort(arrytser[indx, 0])]
+    time = arrytser[indx, 0]
+    flux = arrytser[indx, 1]
+    
+    dicttria = dict()
+    dicttria['s2nrtria'] = 0.
+    dicttria['duratria'] = np.nan
+    if time.size < 2:
+        dicttria['stdvtria'] = np.nan
+        dicttria['numboutlposi'] = 0
+        dicttria['numboutlnega'] = 0
+        return dicttria
+
+    resi = flux - np.median(flux)
+    stdv = 1.4826 * np.median(abs(resi))
+    dicttria['stdvtria'] = stdv
+    dicttria['numboutlposi'] = int(np.sum(resi > 5. * stdv))
+    dicttria['numboutlnega'] = int(np.sum(resi < -5. * stdv))
+    if stdv == 0.:
+        return dicttria
+    
+    # residuals binned onto a uniform grid at the cadence, so that box templates become running sums
+    cade = np.median(np.diff(time))
+    if cade <= 0.:
+        return dicttria
+    indxbins = np.round((time - time[0]) / cade).astype(int)
+    numbbins = indxbins[-1] + 1
+    cumsresi = np.concatenate([[0.], np.cumsum(np.bincount(indxbins, weights=resi, minlength=numbbins))])
+    cumsnumb = np.concatenate([[0], np.cumsum(np.bincount(indxbins, minlength=numbbins))])
+    
+    for duratria in listduratria:
+        numbbinswind = max(1, int(round(duratria / cade)))
+        if numbbinswind >= numbbins:
+            continue
+        sumswind = cumsresi[numbbinswind:] - cumsresi[:-numbbinswind]
+        numbwind = cumsnumb[numbbinswind:] - cumsnumb[:-numbbinswind]
+        
+        # windows that are at least half filled with data
+        boolwind = numbwind >= max(1, numbbinswind // 2)
+        if not boolwind.any():
+            continue
+        s2nr = np.max(sumswind[boolwind] / (stdv * np.sqrt(numbwind[boolwind])))
+        if s2nr > dicttria['s2nrtria']:
+            dicttria['s2nrtria'] = s2nr
+            dicttria['duratria'] = duratria
+
+    return dicttria
+
+
+def retr_listlablclasdisp(boolcalclspe, boolsrchboxsperi, boolsrchoutlperi):
+    '''
+    Return the labels of the disposition classes and the names of the statistics collected from the miletos analyses
+    '''
+    
+    listlablclasdisp = []
+    listnamefeatstat = []
+    if boolcalclspe:
+        listlablclasdisp.append('High LS power')
+        listlablclasdisp.append('Low LS power')
+        listnamefeatstat += ['perilspeprim', 'powrlspeprim']
+    if boolsrchboxsperi:
+        listlablclasdisp.append('High BLS power')
+        listlablclasdisp.append('Low BLS power')
+        listnamefeatstat += ['peripboxprim', 's2nrpboxprim']
+    if boolsrchoutlperi:
+        listlablclasdisp.append('Low min$_k$ $f_k$')
+        listlablclasdisp.append('High min$_k$ $f_k$')
+        listnamefeatstat += ['minmfrddtimeoutlsort']
+    
+    return listlablclasdisp, listnamefeatstat
+
+
+def retr_dictrslttarg(n, dictmileoutp):
+    '''
+    Return the compact result record of a target to be sent back from the worker to the parent process
+    '''
+    
+    dictrslt = dict()
+    dictrslt['indxtarg'] = n
+    for name in ['boolcalclspe', 'boolsrchboxsperi', 'boolsrchoutlperi']:
+        dictrslt[name] = dictmileoutp[name]
+    
+    listlablclasdisp, _ = retr_listlablclasdisp(dictmileoutp['boolcalclspe'], dictmileoutp['boolsrchboxsperi'], dictmileoutp['boolsrchoutlperi'])
+    
+    # features
+    dictrslt['dictfeat'] = dict()
+    if dictmileoutp['boolcalclspe']:
+        dictrslt['dictfeat']['perilspeprim'] = dictmileoutp['perilspempow']
+        dictrslt['dictfeat']['powrlspeprim'] = dictmileoutp['powrlspempow']
+    if dictmileoutp['boolsrchboxsperi']:
+        dictrslt['dictfeat']['s2nrpboxprim'] = dictmileoutp['dictboxsperioutp']['s2nr'][0]
+        dictrslt['dictfeat']['peripboxprim'] = dictmileoutp['dictboxsperioutp']['peri'][0]
+    if dictmileoutp['boolsrchoutlperi']:
+        dictrslt['dictfeat']['minmfrddtimeoutlsort'] = dictmileoutp['dictoutlperi']['minmfrddtimeoutlsort'][0]
+    
+    # dispositions, taking the fist element, which belongs to the first TCE
+    dictrslt['boolposi'] = np.array([dictmileoutp['boolposianls'][u] for u in range(len(listlablclasdisp))], dtype=bool)
+    
+    return dictrslt
+
+
+def setp_clasdisp(gdat, dictrslt):
+    '''
+    Set up the disposition classes and preallocate the arrays of the statistics to be collected, based on the Boolean flags of the 
+    analyses in the first result record, or in the flags expected for the type of per-target analysis if no target has been analyzed
+    '''
+    
+    gdat.listlablclasdisp, gdat.listnamefeatstat = retr_listlablclasdisp(dictrslt['boolcalclspe'], dictrslt['boolsrchboxsperi'], dictrslt['boolsrchoutlperi'])
+    
+    gdat.numbtypeclasdisp = len(gdat.listlablclasdisp)
+    gdat.indxtypeclasdisp = np.arange(gdat.numbtypeclasdisp)
+    gdat.boolpositarg = [np.zeros(gdat.numbtarg, dtype=bool) for u in gdat.indxtypeclasdisp]
+    
+    gdat.listnameclasdispposi = ''
+    
+    gdat.listnameclasdisp = [[] for u in gdat.indxtypeclasdisp]
+    for u in gdat.indxtypeclasdisp:
+        gdat.listnameclasdisp[u] = ''.join(gdat.listlablclasdisp[u].split(' '))
+    
+    # output features of miletos
+    gdat.dictstat = dict()
+    for u in gdat.indxtypeclasdisp:
+        gdat.dictstat[gdat.listnameclasdisp[u]] = dict()
+        for namefeat in gdat.listnamefeatstat:
+            gdat.dictstat[gdat.listnameclasdisp[u]][namefeat] = [np.full(gdat.numbtarg, np.nan), '']
+    
+    # measured wall-clock time spent on each target
+    gdat.timeexecmeastarg = np.full(gdat.numbtarg, np.nan)
+    
+    # measured wall-clock and CPU times spent on each stage of each target
+    gdat.dicttimestagtarg = dict()
+    for namestag in gdat.listnamestagtarg:
+        gdat.dicttimestagtarg[namestag] = np.full((gdat.numbtarg, 2), np.nan)
+    
+    # Boolean flag indicating whether miletos made plots for each target
+    gdat.boolplottarg = np.zeros(gdat.numbtarg, dtype=bool)
+    
+    # triage statistics of each target
+    if gdat.booltria:
+        gdat.dicttriatarg = dict()
+        for nametria in gdat.listnametria:
+            gdat.dicttriatarg[nametria] = np.full(gdat.numbtarg, np.nan)
+    
+    setp_tablfeat(gdat)
+
+    if gdat.boolsimusome:
+        setp_accuperf(gdat)
+
+
+def setp_tablfeat(gdat):
+    '''
+    Create the columnar, memory-mapped table of per-target features, with one file per column and one row per target
+    '''
+    
+    gdat.pathtablfeat = gdat.pathdatashrd + 'Feature_Table/'
+    os.system('mkdir -p %s' % gdat.pathtablfeat)
+    
+    dicttypecols = dict()
+    for namefeat in gdat.listnamefeatstat:
+        dicttypecols[namefeat] = float
+    for u in gdat.indxtypeclasdisp:
+        dicttypecols['boolposi' + gdat.listnameclasdisp[u]] = bool
+    dicttypecols['timeexec'] = float
+    dicttypecols['timecpuu'] = float
+    dicttypecols['boolcomp'] = bool
+    if hasattr(gdat, 'sdeeexpctarg'):
+        dicttypecols['sdeeexpc'] = float
+        dicttypecols['booldeteexpc'] = bool
+    if gdat.booltria:
+        for nametria in gdat.listnametria:
+            dicttypecols[nametria] = float
+    dicttypecols['TICID'] = np.int64
+    dicttypecols['strgtarg'] = 'U%d' % max(1, max([len(str(strgtarg)) for strgtarg in gdat.strgtarg]))
+    
+    gdat.dicttablfeat = dict()
+    for namecols, typecols in dicttypecols.items():
+        gdat.dicttablfeat[namecols] = np.lib.format.open_memmap(gdat.pathtablfeat + '%s.npy' % namecols, mode='w+', dtype=typecols, shape=(gdat.numbtarg,))
+        if typecols == float:
+            gdat.dicttablfeat[namecols][:] = np.nan
+    
+    for n in gdat.indxtarg:
+        if isinstance(gdat.listticitarg[n], list):
+            gdat.dicttablfeat['TICID'][n] = -1
+        else:
+            gdat.dicttablfeat['TICID'][n] = gdat.listticitarg[n]
+    gdat.dicttablfeat['strgtarg'][:] = [str(strgtarg) for strgtarg in gdat.strgtarg]
+    if hasattr(gdat, 'sdeeexpctarg'):
+        gdat.dicttablfeat['sdeeexpc'][:] = gdat.sdeeexpctarg
+        gdat.dicttablfeat['booldeteexpc'][:] = gdat.booldeteexpctarg
+
+
+def retr_dicttablfeat(pathtablfeat, listnamecols=None, boolcomp=False):
+    '''
+    Open the columnar table of per-target features in read-only mode without loading it into memory
+    
+    If boolcomp is True, only the rows of the finished targets are returned (which loads the requested columns).
+    '''
+    
+    if listnamecols is None:
+        listnamecols = [namefile[:-4] for namefile in sorted(os.listdir(pathtablfeat)) if namefile.endswith('.npy')]
+    
+    dicttablfeat = dict()
+    for namecols in listnamecols:
+        dicttablfeat[namecols] = np.load(pathtablfeat + '%s.npy' % namecols, mmap_mode='r')
+    
+    if boolcomp:
+        boolcomptarg = np.load(pathtablfeat + 'boolcomp.npy', mmap_mode='r')
+        indx = np.where(boolcomptarg)[0]
+        for namecols in listnamecols:
+            dicttablfeat[namecols] = dicttablfeat[namecols][indx]
+
+    return dicttablfeat
+
+
+def setp_rslttarg(gdat, dictrslt):
+    '''
+    Scatter a per-target result record into the preallocated arrays of the global object
+    '''
+    
+    if not hasattr(gdat, 'dictstat'):
+        setp_clasdisp(gdat, dictrslt)
+    
+    n = dictrslt['indxtarg']
+    for u in gdat.indxtypeclasdisp:
+        for namefeat in gdat.listnamefeatstat:
+            gdat.dictstat[gdat.listnameclasdisp[u]][namefeat][0][n] = dictrslt['dictfeat'][namefeat]
+        gdat.boolpositarg[u][n] = dictrslt['boolposi'][u]
+    
+    gdat.timeexecmeastarg[n] = dictrslt['timeexec']
+    for namestag in gdat.listnamestagtarg:
+        # records written before a stage was introduced do not have its times
+        gdat.dicttimestagtarg[namestag][n, :] = dictrslt['dicttimestag'].get(namestag, [np.nan, np.nan])
+    gdat.boolplottarg[n] = dictrslt['boolplot']
+    gdat.boolcomptarg[n] = True
+    
+    # append the row of the target to the table of features
+    for namefeat in gdat.listnamefeatstat:
+        gdat.dicttablfeat[namefeat][n] = dictrslt['dictfeat'][namefeat]
+    for u in gdat.indxtypeclasdisp:
+        gdat.dicttablfeat['boolposi' + gdat.listnameclasdisp[u]][n] = dictrslt['boolposi'][u]
+    gdat.dicttablfeat['timeexec'][n] = dictrslt['timeexec']
+    gdat.dicttablfeat['timecpuu'][n] = sum([listtime[1] for listtime in dictrslt['dicttimestag'].values()])
+    gdat.dicttablfeat['boolcomp'][n] = True
+    if gdat.booltria and 'dicttria' in dictrslt:
+        for nametria in gdat.listnametria:
+            gdat.dicttriatarg[nametria][n] = dictrslt['dicttria'][nametria]
+            gdat.dicttablfeat[nametria][n] = dictrslt['dicttria'][nametria]
+    
+    if gdat.boolsimusome:
+        updt_accuperf(gdat, dictrslt)
+
+
+def setp_accuperf(gdat):
+    '''
+    Set up the accumulators of the confusion counts, of the recall binned in the true period, and of the precision binned in the 
+    disposition features, which are updated as the results of targets arrive
+    '''
+    
+    numbbinsperi = gdat.binsperiaccu.size - 1
+    numbbinsfeat = gdat.binsfeataccu.size - 1
+    
+    gdat.dictaccuperf = dict()
+    for nameconf in ['trpo', 'trne', 'flpo', 'flne']:
+        gdat.dictaccuperf[nameconf] = np.zeros((gdat.numbtypeclasdisp, gdat.numbtyperele), dtype=int)
+    
+    # numbers of relevant targets and true positives in bins of the true period
+    gdat.dictaccuperf['numbrelebinsperi'] = np.zeros((gdat.numbtypeclasdisp, gdat.numbtyperele, numbbinsperi), dtype=int)
+    gdat.dictaccuperf['numbtrpobinsperi'] = np.zeros((gdat.numbtypeclasdisp, gdat.numbtyperele, numbbinsperi), dtype=int)
+    
+    # number of relevant targets that did not pass the triage, which is the completeness cost of the triage
+    gdat.dictaccuperf['numbreletriarej'] = np.zeros(gdat.numbtyperele, dtype=int)
+    
+    # numbers of positives and true positives in bins of each disposition feature
+    for namefeat in gdat.listnamefeatstat:
+        gdat.dictaccuperf['numbposibins' + namefeat] = np.zeros((gdat.numbtypeclasdisp, gdat.numbtyperele, numbbinsfeat), dtype=int)
+        gdat.dictaccuperf['numbtrpobins' + namefeat] = np.zeros((gdat.numbtypeclasdisp, gdat.numbtyperele, numbbinsfeat), dtype=int)
+
+
+def updt_accuperf(gdat, dictrslt):
+    '''
+    Update the accumulators of the confusion counts and of the binned recall and precision with the result of a target
+    '''
+    
+    n = dictrslt['indxtarg']
+    
+    boolposi = np.array([gdat.boolpositarg[u][n] for u in gdat.indxtypeclasdisp])[:, None]
+    boolrele = np.array([gdat.boolreletarg[v][n] for v in gdat.indxtypeclastrue])[None, :]
+    booltrpo = boolposi & boolrele
+    
+    gdat.dictaccuperf['trpo'] += booltrpo
+    gdat.dictaccuperf['trne'] += ~boolposi & ~boolrele
+    gdat.dictaccuperf['flpo'] += boolposi & ~boolrele
+    gdat.dictaccuperf['flne'] += ~boolposi & boolrele
+    
+    if 'dicttria' in dictrslt and not dictrslt['dicttria']['booltriapass']:
+        gdat.dictaccuperf['numbreletriarej'] += boolrele[0, :]
+    
+    indxbins = np.searchsorted(gdat.binsperiaccu, gdat.periaccutarg[n], side='right') - 1
+    if np.isfinite(gdat.periaccutarg[n]) and 0 <= indxbins < gdat.binsperiaccu.size - 1:
+        gdat.dictaccuperf['numbrelebinsperi'][:, :, indxbins] += boolrele
+        gdat.dictaccuperf['numbtrpobinsperi'][:, :, indxbins] += booltrpo
+    
+    for namefeat in gdat.listnamefeatstat:
+        feat = dictrslt['dictfeat'][namefeat]
+        if not np.isfinite(feat):
+            continue
+        indxbins = np.searchsorted(gdat.binsfeataccu, feat, side='right') - 1
+        gdat.dictaccuperf['numbposibins' + namefeat][:, :, indxbins] += boolposi
+        gdat.dictaccuperf['numbtrpobins' + namefeat][:, :, indxbins] += booltrpo
+
+
+def writ_accuperf(gdat):
+    '''
+    Write a snapshot of the accumulated confusion counts, recall, and precision to disk
+    '''
+    
+    dictaccuperf = dict(gdat.dictaccuperf)
+    dictaccuperf['numbtargcomp'] = gdat.numbtargcomp
+    dictaccuperf['numbtarg'] = gdat.numbtarg
+    dictaccuperf['strgtimesnap'] = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    dictaccuperf['listnameclasdisp'] = gdat.listnameclasdisp
+    dictaccuperf['binsperi'] = gdat.binsperiaccu
+    dictaccuperf['binsfeat'] = gdat.binsfeataccu
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dictaccuperf['reca'] = gdat.dictaccuperf['trpo'] / (gdat.dictaccuperf['trpo'] + gdat.dictaccuperf['flne'])
+        dictaccuperf['prec'] = gdat.dictaccuperf['trpo'] / (gdat.dictaccuperf['trpo'] + gdat.dictaccuperf['flpo'])
+        dictaccuperf['fracreletriarej'] = gdat.dictaccuperf['numbreletriarej'] / (gdat.dictaccuperf['trpo'][0, :] + gdat.dictaccuperf['flne'][0, :])
+        dictaccuperf['recabinsperi'] = gdat.dictaccuperf['numbtrpobinsperi'] / gdat.dictaccuperf['numbrelebinsperi']
+        for namefeat in gdat.listnamefeatstat:
+            dictaccuperf['precbins' + namefeat] = gdat.dictaccuperf['numbtrpobins' + namefeat] / gdat.dictaccuperf['numbposibins' + namefeat]
+    
+    # write to a temporary file first so that the snapshot on disk is never partially written
+    path = gdat.pathdatashrd + 'Performance.json'
+    with open(path + '.temp', 'w') as objtfile:
+        json.dump(dictaccuperf, objtfile, default=retr_objtjson)
+    os.replace(path + '.temp', path)
+    
+    for u in gdat.indxtypeclasdisp:
+        for v in gdat.indxtypeclastrue:
+            logg.info('%s, relevance type %d: recall %.3g, precision %.3g after %d targets', \
+                            gdat.listnameclasdisp[u], v, dictaccuperf['reca'][u, v], dictaccuperf['prec'][u, v], gdat.numbtargcomp)
+
+
+def retr_dictconf(boolposi, boolrele):
+    '''
+    Return the confusion sets of all pairs of disposition and true classes, computed over targets packed as bitsets
+    
+    Arguments
+        boolposi: Boolean array of shape (numbtypeclasdisp, numbtarg) indicating positive dispositions
+        boolrele: Boolean array of shape (numbtyperele, numbtarg) indicating relevant targets
+
+    Returns a dictionary, where dictconf['numb'][name] is an array of shape (numbtypeclasdisp, numbtyperele) with the number of targets 
+    and dictconf['indx'][name][u][v] is the array of target indices for each of the confusion sets trpo, trne, flpo and flne.
+    '''
+    
+    numbtarg = boolposi.shape[1]
+    numbposi = boolposi.shape[0]
+    numbrele = boolrele.shape[0]
+    
+    # bitsets of shape (numbtypeclasdisp, numbtyperele, numbbyte)
+    bitsposi = np.packbits(boolposi, axis=1)[:, None, :]
+    bitsrele = np.packbits(boolrele, axis=1)[None, :, :]
+    
+    # mask of the valid bits, since the padding bits of the last byte must not be set by the negations
+    bitsvali = np.packbits(np.ones(numbtarg, dtype=bool))
+    
+    dictbits = dict()
+    dictbits['trpo'] = bitsposi & bitsrele
+    dictbits['trne'] = ~bitsposi & ~bitsrele & bitsvali
+    dictbits['flpo'] = bitsposi & ~bitsrele & bitsvali
+    dictbits['flne'] = ~bitsposi & bitsrele & bitsvali
+    
+    # number of set bits in each byte value
+    numbbitsbyte = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(1)
+
+    dictconf = dict()
+    dictconf['numb'] = dict()
+    dictconf['indx'] = dict()
+    for name, bits in dictbits.items():
+        dictconf['numb'][name] = numbbitsbyte[bits].sum(-1)
+        
+        # target indices of all pairs at once, split into the pairs
+        indxposi, indxrele, indxtarg = np.nonzero(np.unpackbits(bits, axis=-1, count=numbtarg))
+        indxpair = indxposi * numbrele + indxrele
+        listindxtarg = np.split(indxtarg, np.searchsorted(indxpair, np.arange(1, numbposi * numbrele)))
+        dictconf['indx'][name] = [[listindxtarg[u * numbrele + v] for v in range(numbrele)] for u in range(numbposi)]
+    
+    return dictconf
+
+
+def retr_indxsysttarg(indxtargpopl, indxtarg):
+    '''
+    Return the indices of targets within a simulated population of systems via sorted search
+    
+    Arguments
+        indxtargpopl: sorted array of the target indices of the systems in the population
+        indxtarg: array of target indices
+
+    Returns the index of each target within the population and a Boolean mask indicating the targets that belong to the population.
+    '''
+    
+    indxtarg = np.asarray(indxtarg, dtype=int)
+    if indxtargpopl.size == 0:
+        return np.zeros(indxtarg.size, dtype=int), np.zeros(indxtarg.size, dtype=bool)
+    
+    indxsyst = np.minimum(np.searchsorted(indxtargpopl, indxtarg), indxtargpopl.size - 1)
+    boolpopl = indxtargpopl[indxsyst] == indxtarg
+
+    return indxsyst, boolpopl
+
+
+def retr_indxstarbody(indxbodystar):
+    '''
+    Return the index of the star of each body (companion or flare) of a simulated population, given the indices of the bodies of each star
+    '''
+    
+    listindxbodystar = retr_listindxcompstar(indxbodystar, range(len(indxbodystar)))
+    numbbodystar = np.array([indxbody.size for indxbody in listindxbodystar], dtype=int)
+    
+    indxstarbody = np.empty(np.sum(numbbodystar), dtype=int)
+    indxstarbody[np.concatenate(listindxbodystar + [np.empty(0, dtype=int)])] = np.repeat(np.arange(numbbodystar.size), numbbodystar)
+    
+    return indxstarbody
+
+
+def retr_numbsamppopl(dictpopl):
+    '''
+    Return the number of samples in a simulated population
+    '''
+    
+    return len(next(iter(dictpopl.values()))[0])
+
+
+def retr_indxbodytran(dictpopltotl, dictpopltran):
+    '''
+    Return the indices of the bodies of the population of all bodies that make up the population of transiting bodies
+    '''
+    
+    if not 'booltran' in dictpopltotl:
+        raise Exception('The transiting bodies of the simulated population cannot be identified, since it has no booltran feature.')
+    
+    indxbodytran = np.where(dictpopltotl['booltran'][0])[0]
+    if indxbodytran.size != retr_numbsamppopl(dictpopltran):
+        raise Exception('The transiting bodies of the simulated population (%d) do not match the population of transiting bodies (%d).' % \
+                                                                                        (indxbodytran.size, retr_numbsamppopl(dictpopltran)))
+
+    return indxbodytran
+
+
+def setp_indxtargpopltrue(gdat, namepopl, indxtargbody):
+    '''
+    Store the target indices of the rows of a simulated population, sorted for the sorted search of retr_indxrowspopltrue, along with the rows 
+    in that order
+    '''
+    
+    if indxtargbody.size != retr_numbsamppopl(gdat.dictpopltrue[namepopl]):
+        raise Exception('The number of bodies (%d) does not match the size of the simulated population %s (%d).' % \
+                                                                    (indxtargbody.size, namepopl, retr_numbsamppopl(gdat.dictpopltrue[namepopl])))
+    
+    indxrowssort = np.argsort(indxtargbody, kind='stable')
+    gdat.dictindxtargpopltrue[namepopl] = indxtargbody[indxrowssort]
+    gdat.dictindxrowspopltrue[namepopl] = indxrowssort
+
+
+def retr_indxrowspopltrue(gdat, namepopl, indxtarg):
+    '''
+    Return the row of the first body (companion or flare) of each target in a simulated population, and a Boolean mask indicating the targets 
+    that have a body in the population
+    '''
+    
+    indxsyst, boolpopl = retr_indxsysttarg(gdat.dictindxtargpopltrue[namepopl], indxtarg)
+    if gdat.dictindxrowspopltrue[namepopl].size == 0:
+        return indxsyst, boolpopl
+
+    return gdat.dictindxrowspopltrue[namepopl][indxsyst], boolpopl
+
+
+def retr_featpopltrue(gdat, namepopl, namefeat, indxtarg):
+    '''
+    Return a true feature of the first body of each of a set of targets in a simulated population, which is NaN for targets that do not 
+    have a body in the population
+    '''
+    
+    indxrows, boolpopl = retr_indxrowspopltrue(gdat, namepopl, indxtarg)
+    feat = np.full(indxrows.size, np.nan)
+    feat[boolpopl] = gdat.dictpopltrue[namepopl][namefeat][0][indxrows[boolpopl]]
+
+    return feat
+
+
+def retr_sdeeexpctarg(gdat, indxtarg):
+    '''
+    Return the expected signal detection efficiency (SDE) of the simulated systems of a set of targets, based on their signal amplitudes, 
+    durations, and the expected photometric noise, which is NaN for targets outside the simulated population of the type of system
+    '''
+    
+    import nicomedia
+    
+    namepopl = gdat.namepopltruetotl
+    
+    if gdat.typesyst == 'CompactObjectStellarCompanion':
+        namesign = 'amplslen'
+    else:
+        namesign = 'depttrancomp'
+    
+    if any([strginst.startswith('TESS') for strginst in gdat.listlablinst[0]]):
+        listnamefeat = ['magtsystTESS', namesign, 'duratrantotl']
+    elif any([strginst.startswith('LSST') for strginst in gdat.listlablinst[0]]):
+        listnamefeat = ['rmag', namesign, 'dcyc']
+    else:
+        listnamefeat = None
+
+    if listnamefeat is None or not all([namefeat in gdat.dictpopltrue[namepopl] for namefeat in listnamefeat]):
+        logg.warning('The expected SDE cannot be computed for the simulated population %s.', namepopl)
+        return np.full(len(indxtarg), np.nan)
+    
+    dictfeat = dict()
+    for namefeat in listnamefeat:
+        dictfeat[namefeat] = retr_featpopltrue(gdat, namepopl, namefeat, indxtarg)
+    
+    if listnamefeat[0] == 'magtsystTESS':
+        nois = nicomedia.retr_noistess(dictfeat['magtsystTESS'])
+        sdee = np.sqrt(dictfeat['duratrantotl']) * dictfeat[namesign] / nois
+    else:
+        # number of visits
+        numbvisi = 1000
+        nois = nicomedia.retr_noislsst(dictfeat['rmag'])
+        sdee = dictfeat[namesign] / 5. / nois * np.sqrt(dictfeat['dcyc'] * numbvisi)
+    
+    return sdee
+
+
+def retr_dictrslttargskip(gdat, n):
+    '''
+    Return the result record of a target that is not analyzed since its simulated system is expected to be far below the detection threshold
+    '''
+    
+    dictrslt = retr_dictrslttarg(n, retr_dictmileoutpnull(retr_dictboolanls(gdat.typemile)))
+    dictrslt['dicttimestag'] = {namestag: [0., 0.] for namestag in gdat.listnamestagtarg}
+    dictrslt['timeexec'] = 0.
+    dictrslt['boolplot'] = False
+
+    return dictrslt
+
+
+def retr_indxshrdtarg(strgtarg, numbshrd, typeshrd):
+    '''
+    Return the shard of each target for runs split across nodes
+    
+    Arguments
+        strgtarg: list of target strings
+        numbshrd: number of shards
+        typeshrd: type of sharding
+            'rang': contiguous ranges of target indices
+            'hash': hash of the target string, which is independent of the order of targets
+    '''
+    
+    numbtarg = len(strgtarg)
+    if typeshrd == 'rang':
+        indxshrdtarg = (np.arange(numbtarg) * numbshrd) // max(numbtarg, 1)
+    elif typeshrd == 'hash':
+        indxshrdtarg = np.array([zlib.crc32(str(strg).encode()) % numbshrd for strg in strgtarg], dtype=int)
+    else:
+        raise Exception('Unknown typeshrd: %s' % typeshrd)
+
+    return indxshrdtarg
+
+
+def retr_pathdatashrd(gdat, indxshrd):
+    '''
+    Return the path of the data folder of a shard
+    '''
+    
+    return gdat.pathpopl + 'Shard%04d/data/' % indxshrd
+
+
+def writ_ledgtarg(gdat, dictrslt):
+    '''
+    Append the result record of a finished target to the on-disk ledger
+    '''
+    
+    n = dictrslt['indxtarg']
+    
+    dictledg = dict()
+    dictledg['indxtarg'] = int(n)
+    dictledg['strgtarg'] = str(gdat.strgtarg[n])
+    for name in ['boolcalclspe', 'boolsrchboxsperi', 'boolsrchoutlperi']:
+        dictledg[name] = bool(dictrslt[name])
+    dictledg['dictfeat'] = {namefeat: float(valu) for namefeat, valu in dictrslt['dictfeat'].items()}
+    dictledg['boolposi'] = [bool(valu) for valu in dictrslt['boolposi']]
+    dictledg['timeexec'] = float(dictrslt['timeexec'])
+    dictledg['dicttimestag'] = {namestag: [float(valu) for valu in listtime] for namestag, listtime in dictrslt['dicttimestag'].items()}
+    dictledg['boolplot'] = bool(dictrslt['boolplot'])
+    if 'dicttria' in dictrslt:
+        dictledg['dicttria'] = {nametria: float(valu) for nametria, valu in dictrslt['dicttria'].items()}
+    
+    with open(gdat.pathledgtarg, 'a') as objtfile:
+        objtfile.write(json.dumps(dictledg) + '\n')
+        objtfile.flush()
+        os.fsync(objtfile.fileno())
+
+
+def read_ledgtarg(gdat, pathledgtarg):
+    '''
+    Read the result records of the finished targets from an on-disk ledger
+    
+    Lines that are truncated (e.g., due to a crash while writing) or that belong to a different target list are ignored.
+    '''
+    
+    listdictrslt = []
+    with open(pathledgtarg, 'r') as objtfile:
+        for line in objtfile:
+            try:
+                dictrslt = json.loads(line)
+            except ValueError:
+                continue
+            n = dictrslt['indxtarg']
+            if n >= gdat.numbtarg or dictrslt['strgtarg'] != str(gdat.strgtarg[n]):
+                continue
+            dictrslt['boolposi'] = np.array(dictrslt['boolposi'], dtype=bool)
+            listdictrslt.append(dictrslt)
+
+    return listdictrslt
+
+
+def trun_ledgtarg(pathledgtarg):
+    '''
+    Truncate an on-disk ledger after its last complete line, so that the records appended by a rerun do not run into a truncated line
+    '''
+    
+    with open(pathledgtarg, 'rb+') as objtfile:
+        byts = objtfile.read()
+        if byts and not byts.endswith(b'\n'):
+            objtfile.truncate(byts.rfind(b'\n') + 1)
 
-import numpy as np
-import scipy.interpolate
 
-from tdpy.util import summgene
-import tdpy
-import ephesos
-import miletos
-import pergamon
-import nicomedia
-import chalcedon
+def updt_rslttarg(gdat, dictrslt):
+    '''
+    Process the result record of a target as soon as it arrives in the parent process
+    '''
+    
+    setp_rslttarg(gdat, dictrslt)
+    writ_ledgtarg(gdat, dictrslt)
+    
+    gdat.numbtargcomp += 1
+    gdat.numbtargcompsess += 1
+    
+    # report the finished prefetches
+    if hasattr(gdat, 'objtpoolpref'):
+        subm_prefmast(gdat)
+    gdat.listtimewallcomp.append(time.perf_counter())
+    if gdat.listtimewallcomp[-1] - gdat.timewallprog > gdat.timeprog or gdat.numbtargcomp == gdat.numbtarg:
+        prnt_prog(gdat)
+        if gdat.boolsimusome:
+            writ_accuperf(gdat)
 
 
-def retr_dictderi_effe(para, gdat):
+def retr_yieldexpctarg(gdat):
+    '''
+    Return the expected scientific yield of each target in relative units, used to analyze the most valuable targets first
     
-    radistar = para[0]
-    peri = para[1]
-    masscomp = para[2]
-    massstar = para[3]
-    masstotl = massstar + masscomp
+    The yield is the expected detectability of the simulated system if the analytic pre-screen is available, and otherwise 
+    the relative signal-to-noise ratio of a fixed signal, which increases with the brightness and the number of sectors of the target.
+    '''
+    
+    if hasattr(gdat, 'sdeeexpctarg'):
+        # score that rises from 0 to 1 around the detection threshold
+        with np.errstate(over='ignore'):
+            yieldexpc = 1. / (1. + np.exp(-(gdat.sdeeexpctarg - gdat.thrssdee)))
+    elif 'magtsystTESS' in gdat.dictfeatprio:
+        import nicomedia
+        
+        numbtsec = gdat.dictfeatprio.get('numbtsec', np.ones(gdat.numbtarg))
+        yieldexpc = np.sqrt(numbtsec) / nicomedia.retr_noistess(gdat.dictfeatprio['magtsystTESS'])
+        yieldexpc /= np.nanmax(yieldexpc)
+    else:
+        yieldexpc = np.ones(gdat.numbtarg)
+    
+    yieldexpc[~np.isfinite(yieldexpc)] = 0.
 
-    amplslenmodl = chalcedon.retr_amplslen(peri, radistar, masscomp, massstar)
-    duratrantotlmodl = ephesos.retr_duratrantotl(peri, radistar, masscomp, massstar, incl)
-    smax = ephesos.retr_smaxkepl(peri, masstotl) * 215. # [R_S]
-    radischw = 4.24e-6 * masscomp # [R_S]
+    return yieldexpc
 
-    dictvarbderi = None
 
-    dictparaderi = dict()
-    dictparaderi['amplslenmodl'] = np.array([amplslenmodl])
-    dictparaderi['duratrantotlmodl'] = np.array([duratrantotlmodl])
-    dictparaderi['smaxmodl'] = np.array([smax])
-    dictparaderi['radischw'] = np.array([radischw])
+def retr_yieldcorehour(gdat):
+    '''
+    Return the expected yield of the finished targets per core-hour spent on them
+    '''
+    
+    timecpuu = sum([np.nansum(gdat.dicttimestagtarg[namestag][gdat.boolcomptarg, 1]) for namestag in gdat.listnamestagtarg])
+    
+    return np.sum(gdat.yieldexpctarg[gdat.boolcomptarg]) / max(timecpuu / 3600., 1e-9)
 
-    return dictparaderi, dictvarbderi
+
+def prnt_prog(gdat):
+    '''
+    Report the number of finished targets, the throughput and the estimated time of arrival
+    '''
+    
+    timewall = time.perf_counter()
+    
+    # throughput over the recently finished targets
+    if len(gdat.listtimewallcomp) > 1 and gdat.listtimewallcomp[-1] > gdat.listtimewallcomp[0]:
+        ratetarg = (len(gdat.listtimewallcomp) - 1) / (gdat.listtimewallcomp[-1] - gdat.listtimewallcomp[0])
+    else:
+        ratetarg = gdat.numbtargcompsess / max(timewall - gdat.timewallwork, 1e-6)
+    
+    numbtargtodo = gdat.numbtarg - gdat.numbtargcomp
+    if ratetarg > 0.:
+        timeeta = numbtargtodo / ratetarg
+    else:
+        timeeta = np.inf
+    
+    logg.info('%d of %d targets finished after %.3g hours. Throughput: %.3g targets per hour. ETA: %.3g hours.', \
+                            gdat.numbtargcomp, gdat.numbtarg, (timewall - gdat.timewallwork) / 3600., ratetarg * 3600., timeeta / 3600.)
+    if hasattr(gdat, 'yieldexpctarg') and hasattr(gdat, 'dicttimestagtarg'):
+        logg.info('Expected yield: %.3g of %.3g, %.3g per core-hour.', np.sum(gdat.yieldexpctarg[gdat.boolcomptarg]), np.sum(gdat.yieldexpctarg), \
+                                                                                                                            retr_yieldcorehour(gdat))
     
+    gdat.timewallprog = timewall
 
-def mile_work(gdat, i):
+
+def writ_timeexec(gdat):
+    '''
+    Write the summary of the measured execution times of the targets and the stages of the run
+    '''
+    
+    dicttimeexec = dict()
     
-    for n in gdat.listindxtarg[i]:
+    # percentiles of the wall-clock and CPU times of each stage over the finished targets
+    listperc = [5., 50., 95., 99.]
+    dicttimeexec['listperc'] = listperc
+    dicttimeexec['stagtarg'] = dict()
+    if hasattr(gdat, 'dicttimestagtarg'):
+        for namestag in gdat.listnamestagtarg:
+            dicttimeexec['stagtarg'][namestag] = dict()
+            for k, strgtime in enumerate(['wall', 'cpuu']):
+                for strgplot, boolplot in [['', None], ['plot', True], ['noplot', False]]:
+                    booltarg = gdat.boolcomptarg & np.isfinite(gdat.dicttimestagtarg[namestag][:, k])
+                    if boolplot is not None:
+                        booltarg &= gdat.boolplottarg == boolplot
+                    if booltarg.any():
+                        listtime = np.percentile(gdat.dicttimestagtarg[namestag][booltarg, k], listperc)
+                        dicttimeexec['stagtarg'][namestag][strgtime + strgplot] = [float(valu) for valu in listtime]
+    
+        dicttimeexec['timewalltotltarg'] = float(np.nansum(gdat.timeexecmeastarg))
+        dicttimeexec['timecpuutotltarg'] = float(sum([np.nansum(gdat.dicttimestagtarg[namestag][:, 1]) for namestag in gdat.listnamestagtarg]))
         
-        if gdat.boolsimusome:
-            for v in gdat.indxtypeclastrue:
-                if n in gdat.dictindxtarg['rele'][v]:
-                    gdat.boolreletarg[v][n] = True
-                else:
-                    gdat.boolreletarg[v][n] = False
-
-        if gdat.typepopl == 'SyntheticPopulation':
-            #listarrytser = dict()
-            #listarrytser['raww'] = gdat.listarrytser['data'][n]
-            
+        # expected yield of the finished targets per core-hour
+        if hasattr(gdat, 'yieldexpctarg'):
+            dicttimeexec['yieldcomp'] = float(np.sum(gdat.yieldexpctarg[gdat.boolcomptarg]))
+            dicttimeexec['yieldtotl'] = float(np.sum(gdat.yieldexpctarg))
+            dicttimeexec['yieldcorehour'] = float(retr_yieldcorehour(gdat))
+    
+    # throughput of this session
+    if hasattr(gdat, 'timewallworkdone'):
+        dicttimeexec['numbtargcompsess'] = int(gdat.numbtargcompsess)
+        dicttimeexec['timewallwork'] = gdat.timewallworkdone - gdat.timewallwork
+        dicttimeexec['ratetarg'] = gdat.numbtargcompsess / max(dicttimeexec['timewallwork'], 1e-6) * 3600. # [targets per hour]
+    
+    # wall-clock and CPU times of the stages of the run
+    dicttimeexec['stagpopl'] = {namestag: [float(valu) for valu in listtime] for namestag, listtime in gdat.dicttimestagpopl.items()}
+    
+    # peak memory allocated during the stages of the run, if traced
+    dicttimeexec['memostagpopl'] = {namestag: int(memo) for namestag, memo in gdat.dictmemostagpopl.items()}
+
+    path = gdat.pathdatashrd + 'Execution_Time.json'
+    logg.info('Writing the summary of execution times to %s...', path)
+    with open(path, 'w') as objtfile:
+        json.dump(dicttimeexec, objtfile, indent=4)
+
+
+def plot_work(namemodl, namefunc, listargs, dictargs):
+    '''
+    Make plots by calling a function of a plotting module, either inside a process of the render pool or inline, 
+    and return the wall-clock and CPU times spent
+    '''
+    
+    import importlib
+    
+    timewall, timecpuu = time.perf_counter(), time.process_time()
+
+    objtmodl = importlib.import_module(namemodl)
+    getattr(objtmodl, namefunc)(*listargs, **dictargs)
+    
+    return [time.perf_counter() - timewall, time.process_time() - timecpuu]
+
+
+def subm_plot(objtpoolplot, listfutuplot, namestag, namemodl, namefunc, *listargs, **dictargs):
+    '''
+    Submit a plotting job of a stage of the run to the render pool, or make the plots inline if there is no render pool
+    '''
+    
+    if objtpoolplot is None:
+        plot_work(namemodl, namefunc, listargs, dictargs)
+    else:
+        listfutuplot.append([namestag, objtpoolplot.submit(plot_work, namemodl, namefunc, listargs, dictargs)])
+
+
+def wait_plot(gdat, objtpoolplot, listfutuplot):
+    '''
+    Wait for the render pool to finish the submitted plotting jobs and shut it down
+    
+    The times spent rendering each job are added to the stage of the run that submitted it, so that the times of the plotting stages 
+    include the rendering also when it is asynchronous.
+    '''
+    
+    if objtpoolplot is None:
+        return
+    
+    logg.info('Waiting for %d plotting jobs to finish...', len(listfutuplot))
+    for namestag, futuplot in listfutuplot:
+        # raise any exception that occurred while plotting
+        listtime = futuplot.result()
+        if not namestag in gdat.dicttimestagpopl:
+            gdat.dicttimestagpopl[namestag] = [0., 0.]
+        gdat.dicttimestagpopl[namestag][0] += listtime[0]
+        gdat.dicttimestagpopl[namestag][1] += listtime[1]
+    objtpoolplot.shutdown()
+
+
+def retr_dictmileinpttarg(gdat, n, boolplottarg):
+    '''
+    Return the miletos input of a target
+    
+    Arguments
+        n: index of the target
+        boolplottarg: Boolean flag to make miletos plots of the target
+    '''
+    
+    if gdat.typepopl == 'SyntheticPopulation':
+        #listarrytser = dict()
+        #listarrytser['raww'] = gdat.listarrytser['data'][n]
+        
+        rasctarg = None
+        decltarg = None
+        strgmast = None
+        labltarg = gdat.labltarg[n]
+        strgtarg = gdat.strgtarg[n]
+        toiitarg = None
+        if len(strgtarg) == 0:
+            raise Exception('')
+    
+    else:
+        if gdat.typepopl == 'MASTKeywords':
             rasctarg = None
             decltarg = None
-            strgmast = None
-            labltarg = gdat.labltarg[n]
-            strgtarg = gdat.strgtarg[n]
+            strgmast = gdat.liststrgmast[n]
+            labltarg = None
+            strgtarg = None
             toiitarg = None
-            if len(strgtarg) == 0:
-                raise Exception('')
-        
-        else:
-            if gdat.typepopl == 'MASTKeywords':
-                rasctarg = None
-                decltarg = None
-                strgmast = gdat.liststrgmast[n]
-                labltarg = None
-                strgtarg = None
-                toiitarg = None
-
-            elif gdat.booldataobsv and gdat.typepopl == 'TOIs':
-                rasctarg = None
-                decltarg = None
-                strgmast = None
-                toiitarg = gdat.listtoiitarg[n]
-                labltarg = None
-                strgtarg = None
-        
-        gdat.dictmileinpttarg = copy.deepcopy(gdat.dictmileinptglob)
-
-        if n < gdat.numbtargplot:
-            # determine whether to make miletos plots of the analysis
-            gdat.dictmileinpttarg['boolplot'] = gdat.boolplotmile
-            
-            # determine whether to make ephesos plots of the simulated data
-            if gdat.boolsimusome:
-                gdat.dictmileinpttarg['boolmakeplotefestrue'] = True
-        else:
-            gdat.dictmileinpttarg['boolplot'] = False
+
+        elif gdat.booldataobsv and gdat.typepopl == 'TOIs':
+            rasctarg = None
+            decltarg = None
+            strgmast = None
+            toiitarg = gdat.listtoiitarg[n]
+            labltarg = None
+            strgtarg = None
+    
+    # coordinates prefetched from MAST, if they are already in the cache, otherwise miletos resolves the target itself
+    if gdat.boolprefmast:
+        dictreso = read_dictresomast(gdat.labltarg[n], gdat.pathcachmast)
+        if dictreso is not None and dictreso['rasctarg'] is not None:
+            rasctarg = dictreso['rasctarg']
+            decltarg = dictreso['decltarg']
+    
+    # miletos input of the target, which stores only the per-target overrides on top of the shared (read-only) global input
+    ## nested containers (e.g., dictboxsperiinpt and dictfitt) are copied shallowly, so that miletos does not modify them for later targets
+    dictmileinpttarg = collections.ChainMap({namevarb: copy.copy(valu) for namevarb, valu in gdat.dictmileinptglob.items() \
+                                                                                    if isinstance(valu, (dict, list, set))}, gdat.dictmileinptglob)
+
+    if boolplottarg:
+        # determine whether to make miletos plots of the analysis
+        dictmileinpttarg['boolplot'] = gdat.boolplotmile
         
-        # determine whether to make animations of simulated data 
+        # determine whether to make ephesos plots of the simulated data
         if gdat.boolsimusome:
-            if n < gdat.numbtarganimtrue:
-                gdat.dictmileinpttarg['boolmakeanimefestrue'] = True
+            dictmileinpttarg['boolmakeplotefestrue'] = True
+    else:
+        dictmileinpttarg['boolplot'] = False
+    
+    # determine whether to make animations of simulated data 
+    if gdat.boolsimusome:
+        if n < gdat.numbtarganimtrue:
+            dictmileinpttarg['boolmakeanimefestrue'] = True
+
+    dictmileinpttarg['rasctarg'] = rasctarg
+    dictmileinpttarg['decltarg'] = decltarg
+    dictmileinpttarg['strgtarg'] = strgtarg
+    dictmileinpttarg['toiitarg'] = toiitarg
+    dictmileinpttarg['labltarg'] = labltarg
+    dictmileinpttarg['strgmast'] = strgmast
+    dictmileinpttarg['boolanls'] = True
+    
+    #dictmileinpttarg['listarrytser'] = listarrytser
+    
+    dictmagtsyst = dict()
+    
+    dicttrue = dict()
+    dicttrue['numbyearlsst'] = 1
+    dicttrue['typemodl'] = 'PlanetarySystem'
+    
+    if gdat.boolsimusome:
+        for namepara in gdat.listnamefeattruetarg:
+            dicttrue[namepara] = gdat.dictarrytruetarg[namepara][n]
+        # features of all companions of the star of the target
+        for namepara in gdat.listnamefeattruetargcomp:
+            dicttrue[namepara] = np.array(gdat.dictarrytruetarg[namepara][gdat.dictarrytruetarg['indxcompoffs'][n]:gdat.dictarrytruetarg['indxcompoffs'][n+1]])
+        
+        dictmileinpttarg['dicttrue'] = dicttrue
+    
+        for b in gdat.indxdatatser:
+            for strginst in gdat.listlablinst[b]:
+                dictmagtsyst[strginst] = dicttrue['magtsyst' + strginst]
+        dictmileinpttarg['dictmagtsyst'] = dictmagtsyst
+    
+    return dictmileinpttarg
+
+
+def retr_strghashmile(dictmileinpttarg, seedglob):
+    '''
+    Return the fingerprint of the effective miletos input of a target, which excludes the inputs that only affect plots and messages
+    '''
+    
+    import miletos
+    
+    listprefplot = ['boolplot', 'boolmakeplot', 'boolmakeanim', 'pathvisu', 'typefileplot', 'boolanim']
+    
+    dictinpt = dict()
+    for name, valu in dictmileinpttarg.items():
+        if name in ['typeverb', 'boolwritover'] or any([name.startswith(strgpref) for strgpref in listprefplot]):
+            continue
+        dictinpt[name] = valu
+    dictinpt['seedglob'] = seedglob
+    dictinpt['versmile'] = getattr(miletos, '__version__', None)
+    
+    return retr_strghash(dictinpt)
+
+
+def read_dictmileoutp(pathcachmile, strghashmile):
+    '''
+    Read the cached miletos outputs consumed by troia for a fingerprint, or return None if there is none
+    '''
+    
+    path = pathcachmile + 'Output_%s.json' % strghashmile
+    if not os.path.exists(path):
+        return None
+    
+    with open(path, 'r') as objtfile:
+        return json.load(objtfile)
+
+
+def writ_dictmileoutp(pathcachmile, strghashmile, dictmileoutp):
+    '''
+    Write the miletos outputs consumed by troia to the cache under a fingerprint
+    '''
+    
+    dictmileoutpcach = dict()
+    for name in ['boolcalclspe', 'boolsrchboxsperi', 'boolsrchoutlperi', 'perilspempow', 'powrlspempow', 'boolposianls']:
+        if name in dictmileoutp:
+            dictmileoutpcach[name] = dictmileoutp[name]
+    if 'dictboxsperioutp' in dictmileoutp:
+        dictmileoutpcach['dictboxsperioutp'] = {name: dictmileoutp['dictboxsperioutp'][name] for name in ['s2nr', 'peri']}
+    if 'dictoutlperi' in dictmileoutp:
+        dictmileoutpcach['dictoutlperi'] = {'minmfrddtimeoutlsort': dictmileoutp['dictoutlperi']['minmfrddtimeoutlsort']}
+    
+    # write to a temporary file first so that the cache never holds a partially written output
+    path = pathcachmile + 'Output_%s.json' % strghashmile
+    with open(path + '.%d.temp' % os.getpid(), 'w') as objtfile:
+        json.dump(dictmileoutpcach, objtfile, default=retr_objtjson)
+    os.replace(path + '.%d.temp' % os.getpid(), path)
+
+
+def mile_work(gdat, indxtargwork):
+    '''
+    Analyze a chunk of targets with miletos and return their result records
+    '''
+    
+    listdictrslt = []
+    for n in indxtargwork:
+        
+        # wall-clock and CPU times spent on each stage of the target
+        dicttimestag = dict()
+        timewall, timecpuu = time.perf_counter(), time.process_time()
 
-        gdat.dictmileinpttarg['rasctarg'] = rasctarg
-        gdat.dictmileinpttarg['decltarg'] = decltarg
-        gdat.dictmileinpttarg['strgtarg'] = strgtarg
-        gdat.dictmileinpttarg['toiitarg'] = toiitarg
-        gdat.dictmileinpttarg['labltarg'] = labltarg
-        gdat.dictmileinpttarg['strgmast'] = strgmast
-        gdat.dictmileinpttarg['boolanls'] = True
+        # targets, for which miletos makes plots, which are made inline since they need the intermediate products of the analysis
+        boolplottarg = n < gdat.numbtargplot
+        gdat.dictmileinpttarg = retr_dictmileinpttarg(gdat, n, boolplottarg)
         
-        #gdat.dictmileinpttarg['listarrytser'] = listarrytser
+        # outputs of an earlier analysis with the same effective input, which is repeated if miletos is to make plots or overwrite
+        dictmileoutp = None
+        if gdat.typemile == 'full' and gdat.boolcachmile:
+            strghashmile = retr_strghashmile(gdat.dictmileinpttarg, retr_seedglob(gdat, 'mile', n))
+            if not gdat.dictmileinpttarg['boolplot'] and not gdat.dictmileinpttarg['boolwritover']:
+                dictmileoutp = read_dictmileoutp(gdat.pathcachmile, strghashmile)
         
-        dictmagtsyst = dict()
+        timewall, timecpuu = updt_timestag(dicttimestag, 'prep', timewall, timecpuu)
         
-        dicttrue = dict()
-        dicttrue['numbyearlsst'] = 1
-        dicttrue['typemodl'] = 'PlanetarySystem'
+        # miletos input of the full analysis
+        dictmileinptanls = gdat.dictmileinpttarg
         
-        if gdat.boolsimusome:
-            for namepara in gdat.dicttroy['true']['PlanetarySystem']['listnamefeatbody']:
-                dicttrue[namepara] = gdat.dicttroy['true']['PlanetarySystem']['dictpopl']['star'][gdat.namepoplstartotl][namepara][0][n]
-            for namepara in gdat.dicttroy['true']['PlanetarySystem']['listnamefeatlimbonly']:
+        # triage of the target with inexpensive statistics of its light curve, unless the full analysis is already in the cache
+        booltriatarg = gdat.booltria and dictmileoutp is None
+        if booltriatarg:
+            if gdat.typemile == 'stub':
+                arrytser = retr_arrytserstub(retr_objtrand(gdat, 'tria', n))
+            else:
+                import miletos
+                np.random.seed(retr_seedglob(gdat, 'mile', n))
+                dictmileinpttria = collections.ChainMap({'boolanls': False, 'boolplot': False}, gdat.dictmileinpttarg)
+                dictmileoutptria = miletos.init(**dictmileinpttria)
+                arrytser = retr_arrytsermile(dictmileoutptria)
                 
-                print('gdat.listindxtarg[i]')
-                summgene(gdat.listindxtarg[i])
-                print('n')
-                print(n)
-                print('gdat.indxcompsyst')
-                summgene(gdat.indxcompsyst)
-
-                dicttrue[namepara] = gdat.dicttroy['true']['PlanetarySystem']['dictpopl']['comp'][gdat.namepoplcomptotl][namepara][0][gdat.indxcompsyst[n]]
-            
-            gdat.dictmileinpttarg['dicttrue'] = dicttrue
-        
-            for b in gdat.indxdatatser:
-                for strginst in gdat.listlablinst[b]:
-                    dictmagtsyst[strginst] = dicttrue['magtsyst' + strginst]
-            gdat.dictmileinpttarg['dictmagtsyst'] = dictmagtsyst
-        
-        # call miletos to analyze data
-        print('Calling miletos...')
-        print('temp')
-        #dictmileoutp = miletos.init( \
-        #                            **gdat.dictmileinpttarg, \
-        #                           )
-        dictmileoutp['boolcalclspe'] = False
-        dictmileoutp['boolsrchboxsperi'] = False
-        dictmileoutp['boolsrchoutlperi'] = True
-
-        if n == 0:
-            gdat.listlablclasdisp = []
-            if dictmileoutp['boolcalclspe']:
-                gdat.listlablclasdisp.append('High LS power')
-                gdat.listlablclasdisp.append('Low LS power')
-            if dictmileoutp['boolsrchboxsperi']:
-                gdat.listlablclasdisp.append('High BLS power')
-                gdat.listlablclasdisp.append('Low BLS power')
-            if dictmileoutp['boolsrchoutlperi']:
-                gdat.listlablclasdisp.append('Low min$_k$ $f_k$')
-                gdat.listlablclasdisp.append('High min$_k$ $f_k$')
-            
-            gdat.numbtypeclasdisp = len(gdat.listlablclasdisp)
-            gdat.indxtypeclasdisp = np.arange(gdat.numbtypeclasdisp)
-            gdat.boolpositarg = [np.empty(gdat.numbtarg, dtype=bool) for u in gdat.indxtypeclasdisp]
-            
-            gdat.listnameclasdispposi = ''
-            
-            gdat.listnameclasdisp = [[] for u in gdat.indxtypeclasdisp]
-            for u in gdat.indxtypeclasdisp:
-                gdat.listnameclasdisp[u] = ''.join(gdat.listlablclasdisp[u].split(' '))
-            
-            if gdat.boolsimusome:
-                gdat.boolreleposi = [[[] for v in gdat.indxtypeclastrue] for u in gdat.indxtypeclasdisp]
-                gdat.boolposirele = [[[] for v in gdat.indxtypeclastrue] for u in gdat.indxtypeclasdisp]
+                # the full analysis takes the light curves retrieved by the triage as input, so that they are not retrieved again
+                dictmileinptanls = collections.ChainMap({'listarrytser': {'raww': dictmileoutptria['listarrytser']['raww']}}, gdat.dictmileinpttarg)
+            dicttria = retr_dicttria(arrytser, gdat.listduratria)
+            dicttria['booltriapass'] = bool(dicttria['s2nrtria'] >= gdat.thrstria)
         
-            # output features of miletos
-            gdat.dictstat = dict()
-            
-            # list of statistics to be collected
-            gdat.listnamefeatstat = []
-            if dictmileoutp['boolcalclspe']:
-                gdat.listnamefeatstat += ['perilspeprim', 'powrlspeprim']
-            if dictmileoutp['boolsrchboxsperi']:
-                gdat.listnamefeatstat += ['peripboxprim', 's2nrpboxprim']
-            if dictmileoutp['boolsrchoutlperi']:
-                gdat.listnamefeatstat += ['minmfrddtimeoutlsort']
-            
-            for u in gdat.indxtypeclasdisp:
-                gdat.dictstat[gdat.listnameclasdisp[u]] = dict()
-                for namefeat in gdat.listnamefeatstat:
-                    gdat.dictstat[gdat.listnameclasdisp[u]][namefeat] = [np.empty(gdat.numbtarg), '']
-        
-        print('gdat.indxtypeclasdisp')
-        print(gdat.indxtypeclasdisp)
-        print('gdat.listnameclasdisp')
-        print(gdat.listnameclasdisp)
-        print('gdat.dictstat')
-        print(gdat.dictstat)
-        for u in gdat.indxtypeclasdisp:
-            if dictmileoutp['boolcalclspe']:
-                gdat.dictstat[gdat.listnameclasdisp[u]]['perilspeprim'][0][n] = dictmileoutp['perilspempow']
-                gdat.dictstat[gdat.listnameclasdisp[u]]['powrlspeprim'][0][n] = dictmileoutp['powrlspempow']
-            if dictmileoutp['boolsrchboxsperi']:
-                gdat.dictstat[gdat.listnameclasdisp[u]]['s2nrpboxprim'][0][n] = dictmileoutp['dictboxsperioutp']['s2nr'][0]
-                gdat.dictstat[gdat.listnameclasdisp[u]]['peripboxprim'][0][n] = dictmileoutp['dictboxsperioutp']['peri'][0]
-            if dictmileoutp['boolsrchoutlperi']:
-                gdat.dictstat[gdat.listnameclasdisp[u]]['minmfrddtimeoutlsort'][0][n] = dictmileoutp['dictoutlperi']['minmfrddtimeoutlsort'][0]
-        
-        # taking the fist element, which belongs to the first TCE
-        for u in gdat.indxtypeclasdisp:
-            gdat.boolpositarg[u][n] = dictmileoutp['boolposianls'][u]
+        timewall, timecpuu = updt_timestag(dicttimestag, 'tria', timewall, timecpuu)
         
-        if gdat.boolsimusome:
-            for u in gdat.indxtypeclasdisp:
-                for v in gdat.indxtypeclastrue:
-                    if gdat.boolreletarg[v][n]:
-                        if gdat.boolpositarg[u][n]:
-                            gdat.boolposirele[u][v].append(True)
-                        else:
-                            gdat.boolposirele[u][v].append(False)
-                    if gdat.boolpositarg[u][n]:
-                        if gdat.boolreletarg[v][n]:
-                            gdat.boolreleposi[u][v].append(True)
-                        else:
-                            gdat.boolreleposi[u][v].append(False)
+        # call miletos to analyze data, unless the target did not pass the triage
+        boolanlstarg = not booltriatarg or dicttria['booltriapass']
+        
+        if not boolanlstarg:
+            dictmileoutp = retr_dictmileoutpnull(retr_dictboolanls(gdat.typemile))
+        elif gdat.typemile == 'stub':
+            logg.info('Calling miletos for target %s...', gdat.strgtarg[n], extra={'boolrate': True})
+            dictmileoutp = retr_dictmileoutpstub(gdat.dictmileinpttarg, retr_objtrand(gdat, 'mile', n))
+        else:
+            if dictmileoutp is None:
+                import miletos
                 
-    return gdat
+                logg.info('Calling miletos for target %s...', gdat.strgtarg[n], extra={'boolrate': True})
+                
+                # miletos draws from the global random state, which is seeded for each target
+                np.random.seed(retr_seedglob(gdat, 'mile', n))
+                dictmileoutp = miletos.init( \
+                                            **dictmileinptanls, \
+                                           )
+                if gdat.boolcachmile:
+                    writ_dictmileoutp(gdat.pathcachmile, strghashmile, dictmileoutp)
+            else:
+                logg.info('Using the cached miletos output of target %s...', gdat.strgtarg[n], extra={'boolrate': True})
+            
+            dictmileoutp.update(retr_dictboolanls(gdat.typemile))
+        
+        timewall, timecpuu = updt_timestag(dicttimestag, 'mile', timewall, timecpuu)
+        
+        dictrslt = retr_dictrslttarg(n, dictmileoutp)
+        
+        timewall, timecpuu = updt_timestag(dicttimestag, 'stat', timewall, timecpuu)
+        
+        dictrslt['dicttimestag'] = dicttimestag
+        dictrslt['timeexec'] = sum([dicttimestag[namestag][0] for namestag in dicttimestag])
+        dictrslt['boolplot'] = gdat.dictmileinpttarg['boolplot']
+        if booltriatarg:
+            dictrslt['dicttria'] = dicttria
+        
+        listdictrslt.append(dictrslt)
+
+    return listdictrslt
 
 
 def init( \
@@ -284,6 +1848,82 @@ def init( \
         # input dictionary to the population generator
         dictpoplsystinpt=None, \
 
+        # number of targets in a synthetic population
+        numbtarg=None, \
+        
+        # Boolean flag to render the population-level plots in a separate pool of processes, so that the analysis does not wait for them
+        ## miletos plots of the targets are still made inline by the analysis of the targets
+        ## the script calling troia must then guard its entry point with if __name__ == '__main__', since the processes are spawned
+        boolplotasyn=False, \
+        
+        # type of the per-target analysis
+        ## 'full': analysis with miletos
+        ## 'stub': stand-in for miletos with random statistics at negligible cost, used to benchmark the orchestration of troia
+        typemile='full', \
+        
+        # number of shards, into which the targets are split to be analyzed by separate runs (e.g., on different nodes)
+        numbshrd=1, \
+        
+        # index of the shard to be analyzed by this run, or None to analyze all targets
+        indxshrd=None, \
+        
+        # type of sharding
+        ## 'rang': contiguous ranges of target indices
+        ## 'hash': hash of the target string
+        typeshrd='rang', \
+        
+        # Boolean flag to merge the results of all shards, written by earlier runs with indxshrd, instead of analyzing targets
+        boolmergshrd=False, \
+
+        # seed of the random number generator
+        seedrand=0, \
+
+        # Boolean flag to cache synthetic populations on disk, keyed by the inputs of the population generator
+        boolcachpopl=True, \
+
+        # Boolean flag to prefetch the MAST resolutions and light-curve files of upcoming observed targets concurrently with the analysis
+        boolprefmast=None, \
+        
+        # URL of the MAST API used by the prefetch
+        strgurlsmast='https://mast.stsci.edu/api/v0/invoke', \
+        
+        # URL of the file download service of MAST used by the prefetch
+        strgurlsdownmast='https://mast.stsci.edu/api/v0.1/Download/file', \
+        
+        # path, under which the prefetch stages the light-curve files of the targets in the mastDownload/ layout of astroquery and lightkurve
+        ## None: the cache directory of lightkurve
+        ## False: light-curve files are not staged
+        pathstaglcur=None, \
+        
+        # number of upcoming targets beyond those dispatched to the analysis, which are prefetched
+        numbtargpref=64, \
+        
+        # number of threads of the prefetch
+        numbthrdpref=8, \
+        
+        # Boolean flag to reuse the cached miletos outputs of targets, whose effective miletos input has not changed
+        ## None: reuse them only if all data are simulated, since the fingerprint does not capture updates to observed data
+        ## the cached outputs are not read if boolwritover is True
+        boolcachmile=None, \
+        
+        # Boolean flag to triage targets with inexpensive statistics of their light curves before the full analysis
+        booltria=False, \
+        
+        # minimum signal-to-noise ratio of the matched filter for a target to pass the triage
+        thrstria=5., \
+        
+        # expected signal detection efficiency (SDE), above which simulated systems are labeled as expected to be detectable
+        thrssdee=5., \
+        
+        # expected SDE, below which simulated systems are not analyzed and are recorded as negatives, or None to analyze all systems
+        thrssdeeskip=None, \
+        
+        # order, in which the targets are analyzed
+        ## 'cost': longest-expected-first, which balances the load of the worker processes
+        ## 'yield': highest expected yield per CPU second first, so that a partially finished run holds the most valuable results
+        ## None: 'yield' for catalog populations and 'cost' otherwise
+        typeordetarg=None, \
+
         # Boolean flag to turn on diagnostic mode
         booldiag=True, \
 
@@ -299,18 +1939,35 @@ def init( \
 
         ):
     
+    # inputs
+    dictinpt = dict(locals())
+    
+    # use the non-interactive backend of matplotlib, once it gets imported
+    os.environ.setdefault('MPLBACKEND', 'agg')
+    
+    import tdpy
+    from tdpy.util import summgene
+    import miletos
+
     # construct global object
     gdat = tdpy.gdatstrt()
     
     # copy locals (inputs) to the global object
-    for attr, valu in locals().items():
-        if '__' not in attr and attr != 'gdat':
+    for attr, valu in dictinpt.items():
+        if '__' not in attr:
             setattr(gdat, attr, valu)
 
+    setp_logg(gdat.typeverb)
+    
     # string for date and time
     gdat.strgtimestmp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    # wall-clock and CPU times spent on each stage of the run
+    gdat.dicttimestagpopl = dict()
+    gdat.dictmemostagpopl = dict()
+    timewall, timecpuu = time.perf_counter(), time.process_time()
    
-    print('troia initialized at %s...' % gdat.strgtimestmp)
+    logg.info('troia initialized at %s...', gdat.strgtimestmp)
     
     if gdat.boolplotinit is None:
         gdat.boolplotinit = gdat.boolplot
@@ -322,6 +1979,12 @@ def init( \
     if not gdat.boolplot and (gdat.boolplotinit or gdat.boolplotmile):
         raise Exception('')
 
+    if gdat.indxshrd is not None and (gdat.indxshrd < 0 or gdat.indxshrd >= gdat.numbshrd):
+        raise Exception('indxshrd must be between 0 and numbshrd - 1.')
+
+    if gdat.indxshrd is not None and gdat.boolmergshrd:
+        raise Exception('indxshrd and boolmergshrd cannot be defined simultaneously.')
+
     if gdat.liststrgmast is not None and gdat.listticitarg is not None or \
        gdat.liststrgmast is not None and gdat.listtoiitarg is not None or \
        gdat.listticitarg is not None and gdat.listtoiitarg is not None:
@@ -349,6 +2012,15 @@ def init( \
     miletos.setup1_miletos(gdat)
     
     gdat.booltargsynt = not gdat.booltarguser
+    
+    # reuse cached miletos outputs by default only when all data are simulated
+    if gdat.boolcachmile is None:
+        gdat.boolcachmile = gdat.liststrgtypedata is not None and \
+                    all([strgtypedata == 'simutargsynt' for liststrgtypedatatemp in gdat.liststrgtypedata for strgtypedata in liststrgtypedatatemp])
+    
+    # prefetch MAST resolutions by default only when observed targets are analyzed
+    if gdat.boolprefmast is None:
+        gdat.boolprefmast = gdat.booltarguser and gdat.typemile == 'full' and not gdat.boolmergshrd
 
     if gdat.booldiag:
         if gdat.booltargsynt:
@@ -410,8 +2082,7 @@ def init( \
     #        gdat.typepopl = 'CTL_prms_2min'
     #        gdat.typepopl = 'CTL_prms_2min'
     
-    print('gdat.typepopl')
-    print(gdat.typepopl)
+    logg.debug('gdat.typepopl: %s', gdat.typepopl)
 
     # paths
     ## path of the troia data folder
@@ -422,6 +2093,14 @@ def init( \
     
     gdat.pathdatapipe = gdat.pathbase + 'data/'
     gdat.pathvisupipe = gdat.pathbase + 'visuals/'
+    gdat.pathcachpopl = gdat.pathdatapipe + 'Population_Cache/'
+    gdat.pathcachtic8 = gdat.pathdatapipe + 'TIC8_Cache/'
+    gdat.pathcachmast = gdat.pathdatapipe + 'MAST/'
+    gdat.pathcachmile = gdat.pathdatapipe + 'Miletos_Cache/'
+    if gdat.pathstaglcur is None:
+        gdat.pathstaglcur = os.path.expanduser('~/.lightkurve/cache/')
+    elif gdat.pathstaglcur is False:
+        gdat.pathstaglcur = None
     
     gdat.strginstconc = ''
     k = 0
@@ -441,6 +2120,11 @@ def init( \
     gdat.pathpopl = gdat.pathbase + gdat.strgextn + '/'
     gdat.pathvisucnfg = gdat.pathpopl + 'visuals/'
     gdat.pathdatacnfg = gdat.pathpopl + 'data/'
+    ## path of the data folder of the run, which is that of the shard if only a shard is analyzed
+    if gdat.indxshrd is None:
+        gdat.pathdatashrd = gdat.pathdatacnfg
+    else:
+        gdat.pathdatashrd = retr_pathdatashrd(gdat, gdat.indxshrd)
 
     # make folders
     for attr, valu in gdat.__dict__.items():
@@ -448,8 +2132,9 @@ def init( \
             os.system('mkdir -p %s' % valu)
 
     # settings
-    ## seed
-    np.random.seed(0)
+    ## seed of the global random state used by the dependencies during the setup, while troia draws from generators 
+    ## derived from gdat.seedrand for each stage and target
+    np.random.seed(retr_seedglob(gdat, 'setp'))
     
     ## plotting
     gdat.typefileplot = 'png'
@@ -457,7 +2142,7 @@ def init( \
     gdat.boolanimtmpt = False
     
     if not gdat.booltarguser and not gdat.booltargsynt:
-        dicttic8 = nicomedia.retr_dictpopltic8(typepopl=gdat.typepopl)
+        dicttic8 = retr_dicttic8(gdat.typepopl, gdat.pathcachtic8)
         
     # number of time-series data sets
     gdat.numbdatatser = 2
@@ -488,7 +2173,7 @@ def init( \
             gdat.numbtarg = len(gdat.listgaidtarg)
         else:
             raise Exception('')
-    else:
+    elif gdat.numbtarg is None:
         if gdat.boolsimusome:
             gdat.numbtarg = 30000
         else:
@@ -496,29 +2181,48 @@ def init( \
             
         gdat.numbtarg = 100
     
-    print('Number of targets: %s' % gdat.numbtarg)
+    logg.info('Number of targets: %s', gdat.numbtarg)
     gdat.indxtarg = np.arange(gdat.numbtarg)
     
     if not gdat.booltarguser and not gdat.booltargsynt:
-        size = dicttic8['TICID'].size
-        indx = np.random.choice(np.arange(dicttic8['TICID'].size), replace=False, size=size)
-        for name in dicttic8.keys():
-            dicttic8[name] = dicttic8[name][indx]
+        # random order of the catalog rows to be analyzed, applied to the columns only when they are accessed
+        gdat.indxtic8targ = retr_objtrand(gdat, 'tic8').permutation(dicttic8['TICID'].size)[:gdat.numbtarg]
     
+    # prior guess of the execution time of a target, used to schedule targets before any execution time is measured
     gdat.timeexectarg = 120.
-    print('Expected execution time: %g seconds (%.3g days, %.3g weeks for 20M targets)' % (gdat.numbtarg * gdat.timeexectarg, gdat.numbtarg * gdat.timeexectarg / 3600. / 24., \
-                                                                                                                        20e6 * gdat.timeexectarg / 3600. / 24. / 7.))
+    
+    # stages of the analysis of each target, whose execution times are measured
+    gdat.listnamestagtarg = ['prep', 'tria', 'mile', 'stat']
+    
+    # names of the triage statistics
+    gdat.listnametria = ['stdvtria', 's2nrtria', 'duratria', 'numboutlposi', 'numboutlnega', 'booltriapass']
+    
+    # durations of the box templates of the self-lensing template bank used by the triage [day]
+    gdat.listduratria = np.array([1., 2., 4., 8., 16.]) / 24.
+
+    # minimum time between two progress reports [s]
+    gdat.timeprog = 60.
+    
+    # number of recently finished targets over which the throughput is estimated
+    gdat.numbtargrate = 100
     
     if gdat.listticitarg is None:
         gdat.listticitarg = [[] for k in gdat.indxtarg]
     
+    # features of the targets used to prioritize them
+    gdat.dictfeatprio = dict()
+    
     if not gdat.booltarguser and not gdat.booltargsynt:
-        gdat.listticitarg = dicttic8['TICID']
+        gdat.listticitarg = dicttic8['TICID'][gdat.indxtic8targ]
+        
+        for namefeat, listnamecols in [['magtsystTESS', ['magtsystTESS', 'tmag']], ['numbtsec', ['numbtsec', 'numbsect']]]:
+            for namecols in listnamecols:
+                if namecols in dicttic8:
+                    gdat.dictfeatprio[namefeat] = np.asarray(dicttic8[namecols][gdat.indxtic8targ], dtype=float)
+                    break
     
-    print('gdat.boolplot')
-    print(gdat.boolplot)
-    print('gdat.boolplotinit')
-    print(gdat.boolplotinit)
+    logg.debug('gdat.boolplot: %s', gdat.boolplot)
+    logg.debug('gdat.boolplotinit: %s', gdat.boolplotinit)
     
     # target labels and file name extensions
     gdat.strgtarg = [[] for n in gdat.indxtarg]
@@ -571,6 +2275,20 @@ def init( \
     gdat.dictindxtarg = dict()
     gdat.dicttroy = dict()
     
+    # pool of processes rendering the plots, to which the analysis stages submit plotting jobs
+    ## the pool is only started when plots are requested, so that runs without plots do not spawn processes
+    listfutuplot = []
+    if gdat.boolplotasyn and gdat.boolplot:
+        import multiprocessing
+        import concurrent.futures
+        gdat.numbprocplot = 2
+        objtpoolplot = concurrent.futures.ProcessPoolExecutor(max_workers=gdat.numbprocplot, mp_context=multiprocessing.get_context('spawn'))
+    else:
+        gdat.boolplotasyn = False
+        objtpoolplot = None
+
+    timewall, timecpuu = updt_timestagpopl(gdat, 'setp', timewall, timecpuu)
+    
     if gdat.boolsimusome:
         
         gdat.dictprobclastruetype = dict()
@@ -652,7 +2370,7 @@ def init( \
         else:
             raise Exception('')
 
-        gdat.indxclastruetypetarg = np.random.choice(gdat.indxclastruetype, size=gdat.numbtarg, p=gdat.probclastruetype)
+        gdat.indxclastruetypetarg = retr_objtrand(gdat, 'clas').choice(gdat.indxclastruetype, size=gdat.numbtarg, p=gdat.probclastruetype)
             
         #gdat.booltypetargtrue = dict()
         
@@ -664,13 +2382,32 @@ def init( \
         gdat.dictpoplsystinpt['minmnumbcompstar'] = 1
         gdat.dictpoplsystinpt['liststrgband'] = gdat.listlablinst[0]
         
-        indxoffs = 0
         gdat.dictnumbtarg = dict()
         for nameclastruetype in gdat.listnameclastruetype:
             gdat.dictnumbtarg[nameclastruetype] = int(gdat.numbtarg * gdat.dictprobclastruetype[nameclastruetype][0])
         
-            gdat.dicttroy['true'][nameclastruetype] = nicomedia.retr_dictpoplstarcomp(nameclastruetype, \
-                                                            numbsyst=gdat.dictnumbtarg[nameclastruetype], **gdat.dictpoplsystinpt)
+        # generate the populations of the classes, in parallel if there are multiple classes
+        if gdat.boolcachpopl:
+            pathcach = gdat.pathcachpopl
+        else:
+            pathcach = None
+        listargsclas = []
+        for nameclastruetype in gdat.listnameclastruetype:
+            seedclas = retr_seedglob(gdat, 'popl' + nameclastruetype)
+            listargsclas.append((nameclastruetype, gdat.dictnumbtarg[nameclastruetype], seedclas, gdat.dictpoplsystinpt, pathcach))
+        
+        if boolprocmult and gdat.numbclastruetype > 1:
+            import multiprocessing
+            import concurrent.futures
+            with concurrent.futures.ProcessPoolExecutor(max_workers=gdat.numbclastruetype, \
+                                                                mp_context=multiprocessing.get_context('spawn')) as objtpoolpopl:
+                listdictpopl = list(objtpoolpopl.map(retr_dictpoplstarcompclas, *zip(*listargsclas)))
+        else:
+            listdictpopl = [retr_dictpoplstarcompclas(*argsclas) for argsclas in listargsclas]
+        
+        indxoffs = 0
+        for k, nameclastruetype in enumerate(gdat.listnameclastruetype):
+            gdat.dicttroy['true'][nameclastruetype] = listdictpopl[k]
             
             gdat.indxcompsyst = gdat.dicttroy['true'][nameclastruetype]['dictindx']['comp']['star']
 
@@ -717,7 +2454,8 @@ def init( \
                     if gdat.namepoplcomp.endswith('_tran'):
                         raise Exception('')
 
-                summgene(gdat.dicttroy, boolshowlong=False)
+                if logg.isEnabledFor(logging.DEBUG):
+                    summgene(gdat.dicttroy, boolshowlong=False)
                 
                 # list of features for stellar systems
                 listname = np.intersect1d(np.array(list(gdat.dicttroy['true']['CompactObjectStellarCompanion']['dictpopl']['comp'][gdat.namepoplcomp].keys())), \
@@ -754,7 +2492,9 @@ def init( \
         #        raise Exception('')
         
         
-        print('Visualizing the features of the simulated population...')
+        timewall, timecpuu = updt_timestagpopl(gdat, 'popl', timewall, timecpuu)
+        
+        logg.info('Visualizing the features of the simulated population...')
 
         listboolcompexcl = [False]
         listtitlcomp = ['']
@@ -769,11 +2509,37 @@ def init( \
             gdat.dictpopltrue['PlanetarySystem_%s_All' % gdat.typepopl] = gdat.dicttroy['true']['PlanetarySystem']['dictpopl']['comp'][gdat.namepoplcomptotl]
             gdat.dictpopltrue['PlanetarySystem_%s_Transiting' % gdat.typepopl] = gdat.dicttroy['true']['PlanetarySystem']['dictpopl']['comp'][gdat.namepoplcomptran]
         elif gdat.typesyst == 'StarFlaring':
-            gdat.dictpopltrue['StarFlaring_%s_All' % gdat.typepopl] = gdat.dicttroy['true']['StarFlaring']['dictpopl']['flar'][gdat.namepoplcomptotl]
-            gdat.dictpopltrue['StarFlaring_%s_Mdwarfs' % gdat.typepopl] = gdat.dicttroy['true']['StarFlaring']['dictpopl']['flar'][gdat.namepoplcomptotl]
+            gdat.dictpopltrue['StarFlaring_%s_All' % gdat.typepopl] = gdat.dicttroy['true']['StellarFlare']['dictpopl']['flar'][gdat.namepoplcomptotl]
+            gdat.dictpopltrue['StarFlaring_%s_Mdwarfs' % gdat.typepopl] = gdat.dicttroy['true']['StellarFlare']['dictpopl']['flar'][gdat.namepoplcomptotl]
         else:
             raise Exception('')
         
+        # target indices of the rows of each simulated population, which are bodies (companions or flares) mapped to targets via their stars, 
+        # shared by the gathers of true features and the recall plots
+        gdat.dictindxtargpopltrue = dict()
+        gdat.dictindxrowspopltrue = dict()
+        if gdat.typesyst == 'CompactObjectStellarCompanion':
+            gdat.namepopltruetotl = 'CompactObjectStellarCompanion' + gdat.typepopl + 'totl'
+            for nameclas in ['CompactObjectStellarCompanion', 'StellarBinary']:
+                dicttroyclas = gdat.dicttroy['true'][nameclas]
+                indxtargbody = gdat.dictindxtarg[nameclas][retr_indxstarbody(dicttroyclas['dictindx']['comp']['star'])]
+                indxbodytran = retr_indxbodytran(dicttroyclas['dictpopl']['comp'][gdat.namepoplcomptotl], dicttroyclas['dictpopl']['comp'][gdat.namepoplcomptran])
+                setp_indxtargpopltrue(gdat, nameclas + gdat.typepopl + 'totl', indxtargbody)
+                setp_indxtargpopltrue(gdat, nameclas + gdat.typepopl + 'Transiting', indxtargbody[indxbodytran])
+        elif gdat.typesyst == 'PlanetarySystem':
+            gdat.namepopltruetotl = 'PlanetarySystem_%s_All' % gdat.typepopl
+            dicttroyclas = gdat.dicttroy['true']['PlanetarySystem']
+            indxtargbody = gdat.dictindxtarg['PlanetarySystem'][retr_indxstarbody(dicttroyclas['dictindx']['comp']['star'])]
+            indxbodytran = retr_indxbodytran(dicttroyclas['dictpopl']['comp'][gdat.namepoplcomptotl], dicttroyclas['dictpopl']['comp'][gdat.namepoplcomptran])
+            setp_indxtargpopltrue(gdat, 'PlanetarySystem_%s_All' % gdat.typepopl, indxtargbody)
+            setp_indxtargpopltrue(gdat, 'PlanetarySystem_%s_Transiting' % gdat.typepopl, indxtargbody[indxbodytran])
+        elif gdat.typesyst == 'StarFlaring':
+            gdat.namepopltruetotl = 'StarFlaring_%s_All' % gdat.typepopl
+            dicttroyclas = gdat.dicttroy['true']['StellarFlare']
+            indxtargbody = gdat.dictindxtarg['StellarFlare'][retr_indxstarbody(dicttroyclas['dictindx']['flar']['star'])]
+            setp_indxtargpopltrue(gdat, 'StarFlaring_%s_All' % gdat.typepopl, indxtargbody)
+            setp_indxtargpopltrue(gdat, 'StarFlaring_%s_Mdwarfs' % gdat.typepopl, indxtargbody)
+        
         # check if gdat.dictpopltrue is properly defined, which should be a list of two items (of values and labels, respectively)
         if gdat.booldiag:
             for namepopl in gdat.dictpopltrue:
@@ -794,17 +2560,21 @@ def init( \
         
         lablnumbsamp = 'Number of systems'
 
-        pergamon.init( \
-                      typecnfg, \
-                      dictpopl=gdat.dictpopltrue, \
-                      listdictlablcolrpopl=listdictlablcolrpopl, \
-                      lablnumbsamp=lablnumbsamp, \
-                      listboolcompexcl=listboolcompexcl, \
-                      listtitlcomp=listtitlcomp, \
-                      pathvisu=pathvisu, \
-                      pathdata=pathdata, \
-                      boolsortpoplsize=False, \
-                     )
+        # the shards of a split run leave the plots of the population to the merge step
+        if gdat.indxshrd is None:
+            subm_plot(objtpoolplot, listfutuplot, 'plotpopltrue', 'pergamon', 'init', \
+                          typecnfg, \
+                          dictpopl=gdat.dictpopltrue, \
+                          listdictlablcolrpopl=listdictlablcolrpopl, \
+                          lablnumbsamp=lablnumbsamp, \
+                          listboolcompexcl=listboolcompexcl, \
+                          listtitlcomp=listtitlcomp, \
+                          pathvisu=pathvisu, \
+                          pathdata=pathdata, \
+                          boolsortpoplsize=False, \
+                         )
+        
+        timewall, timecpuu = updt_timestagpopl(gdat, 'plotpopltrue', timewall, timecpuu)
         
         # relevant targets
         gdat.dictindxtarg['rele'] = [[] for v in gdat.indxtypeclastrue]
@@ -816,6 +2586,10 @@ def init( \
             gdat.dictindxtarg['rele'][0] = gdat.dictindxtarg['CompactObjectStellarCompanion']
             # relevants are those transiting COSCs
             gdat.dictindxtarg['rele'][1] = gdat.dictindxtarg['cosctran']
+            
+            # simulated populations of the relevant and irrelevant systems
+            gdat.listnamepopltruerele = ['CompactObjectStellarCompanion' + gdat.typepopl + 'totl', 'CompactObjectStellarCompanion' + gdat.typepopl + 'Transiting']
+            gdat.listlistnamepopltrueirre = [['StellarBinary' + gdat.typepopl + 'totl'], ['StellarBinary' + gdat.typepopl + 'totl']]
         elif gdat.typesyst == 'PlanetarySystem':
             
             # this check is probably wrong
@@ -833,10 +2607,18 @@ def init( \
             # relevants are Planetary Systems
             gdat.dictindxtarg['rele'][0] = gdat.dictindxtarg['PlanetarySystem_Transiting']
             gdat.dictindxtarg['irre'][0] = gdat.dictindxtarg['PlanetarySystem_Nontransiting']
+            
+            # simulated populations of the relevant and irrelevant systems, where there is no simulated population of the nontransiting systems
+            gdat.listnamepopltruerele = ['PlanetarySystem_%s_Transiting' % gdat.typepopl]
+            gdat.listlistnamepopltrueirre = [[]]
         
         elif gdat.typesyst == 'StarFlaring':
             #indx = np.where(np.isfinite(gdat.dicttroy['true']['StarFlaring']['dictpopl']['flar'][gdat.namepoplcomptran]['duratrantotl'][gdat.indxssyscosc]))
-            gdat.dictindxtarg['rele'][0] = gdat.dictindxtarg['StarFlaring']
+            gdat.dictindxtarg['rele'][0] = gdat.dictindxtarg['StellarFlare']
+            
+            # simulated populations of the relevant and irrelevant systems
+            gdat.listnamepopltruerele = ['StarFlaring_%s_All' % gdat.typepopl]
+            gdat.listlistnamepopltrueirre = [[]]
         else:
             raise Exception('')
         gdat.numbtargrele = np.empty(gdat.numbtyperele, dtype=int)
@@ -845,27 +2627,41 @@ def init( \
         for v in gdat.indxtypeclastrue:
             gdat.dictindxtarg['irre'][v] = np.setdiff1d(gdat.indxtarg, gdat.dictindxtarg['rele'][v])
             
-            print('gdat.dictindxtarg[irre][v]')
-            print(gdat.dictindxtarg['irre'][v])
-
             # in case it's empty
             gdat.dictindxtarg['irre'][v] = np.array(gdat.dictindxtarg['irre'][v])
 
-            print('gdat.dictindxtarg[irre][v]')
-            print(gdat.dictindxtarg['irre'][v])
+            logg.debug('gdat.dictindxtarg[irre][v]: %s', gdat.dictindxtarg['irre'][v])
 
             gdat.numbtargrele[v] = gdat.dictindxtarg['rele'][v].size
         
+        # indices of the relevant targets within the simulated population of the type of system
         gdat.indxssysrele = [[] for v in gdat.indxtypeclastrue]
         for v in gdat.indxtypeclastrue:
-            cntrssys = 0
-            cntrrele = 0
-            gdat.indxssysrele[v] = np.empty(gdat.numbtargrele[v], dtype=int)
-            for n in gdat.dictindxtarg['rele'][v]:
-                if n in gdat.dictindxtarg['StellarBinary']:
-                    gdat.indxssysrele[v][cntrrele] = cntrssys
-                    cntrssys += 1
-                cntrrele += 1
+            gdat.indxssysrele[v], boolpopl = retr_indxrowspopltrue(gdat, gdat.namepopltruetotl, gdat.dictindxtarg['rele'][v])
+            if gdat.booldiag:
+                if not boolpopl.all():
+                    print('')
+                    print('')
+                    print('')
+                    print('gdat.namepopltruetotl')
+                    print(gdat.namepopltruetotl)
+                    print('v')
+                    print(v)
+                    raise Exception('Some relevant targets do not belong to the simulated population of the type of system.')
+
+        # true features of each target, read by the worker processes from memory-mapped files
+        writ_arrytruetarg(gdat)
+        
+        # analytic pre-screen of the expected detectability of the simulated systems
+        gdat.sdeeexpctarg = retr_sdeeexpctarg(gdat, gdat.indxtarg)
+        gdat.booldeteexpctarg = gdat.sdeeexpctarg > gdat.thrssdee
+        
+        if 'magtsystTESS' in gdat.dictarrytruetarg:
+            gdat.dictfeatprio['magtsystTESS'] = np.asarray(gdat.dictarrytruetarg['magtsystTESS'])
+        if 'numbtsec' in gdat.dictpopltrue[gdat.namepopltruetotl]:
+            gdat.dictfeatprio['numbtsec'] = retr_featpopltrue(gdat, gdat.namepopltruetotl, 'numbtsec', gdat.indxtarg)
+        logg.info('%d of the %d targets are expected to be detectable (expected SDE above %.3g).', \
+                                                        np.sum(gdat.booldeteexpctarg), gdat.numbtarg, gdat.thrssdee)
 
     #if gdat.boolsimusome:
         # move TESS magnitudes from the dictinary of all systems to the dictionaries of each types of system
@@ -903,37 +2699,196 @@ def init( \
     ## make periodic box search single-process because each targets gets its own process
     gdat.dictmileinptglob['dictboxsperiinpt']['boolprocmult'] = False
     
-    if boolprocmult:
+    # relevance of each target, as a Boolean mask over targets
+    if gdat.boolsimusome:
+        for v in gdat.indxtypeclastrue:
+            gdat.boolreletarg[v][:] = False
+            gdat.boolreletarg[v][gdat.dictindxtarg['rele'][v]] = True
+        
+        # true period of each target and the bins in which the recall is accumulated while targets are analyzed
+        if 'pericomp' in gdat.dictpopltrue[gdat.namepopltruetotl]:
+            gdat.periaccutarg = retr_featpopltrue(gdat, gdat.namepopltruetotl, 'pericomp', gdat.indxtarg)
+        else:
+            gdat.periaccutarg = np.full(gdat.numbtarg, np.nan)
+        if np.isfinite(gdat.periaccutarg).any():
+            gdat.binsperiaccu = np.geomspace(np.nanmin(gdat.periaccutarg), np.nanmax(gdat.periaccutarg) * (1. + 1e-6), 11)
+        else:
+            gdat.binsperiaccu = np.geomspace(0.1, 100., 11)
+        
+        # bins in which the precision is accumulated, the same for all disposition features, with overflow bins at both ends
+        gdat.binsfeataccu = np.concatenate([[-np.inf, 0.], np.geomspace(1e-3, 1e4, 22), [np.inf]])
+
+    # ledger of the finished targets, which allows a rerun to skip them
+    gdat.pathledgtarg = gdat.pathdatashrd + 'Ledger_Targets.jsonl'
+    gdat.boolcomptarg = np.zeros(gdat.numbtarg, dtype=bool)
+    if gdat.boolmergshrd:
+        # merge the ledgers of the shards into the ledger of the run
+        open(gdat.pathledgtarg, 'w').close()
+        for indxshrd in range(gdat.numbshrd):
+            path = retr_pathdatashrd(gdat, indxshrd) + 'Ledger_Targets.jsonl'
+            if not os.path.exists(path):
+                logg.warning('Warning! The ledger of shard %d does not exist at %s.', indxshrd, path)
+                continue
+            logg.info('Merging the ledger of shard %d from %s...', indxshrd, path)
+            for dictrslt in read_ledgtarg(gdat, path):
+                setp_rslttarg(gdat, dictrslt)
+                writ_ledgtarg(gdat, dictrslt)
+        if not gdat.boolcomptarg.all():
+            logg.warning('Warning! %d of the %d targets have not been analyzed by any shard.', np.sum(~gdat.boolcomptarg), gdat.numbtarg)
+    elif not gdat.boolwritover and os.path.exists(gdat.pathledgtarg):
+        logg.info('Reading the ledger of finished targets from %s...', gdat.pathledgtarg)
+        for dictrslt in read_ledgtarg(gdat, gdat.pathledgtarg):
+            setp_rslttarg(gdat, dictrslt)
+        trun_ledgtarg(gdat.pathledgtarg)
+        logg.info('%d of the %d targets have already been analyzed.', np.sum(gdat.boolcomptarg), gdat.numbtarg)
+    else:
+        open(gdat.pathledgtarg, 'w').close()
+    
+    # targets yet to be analyzed
+    if gdat.boolmergshrd:
+        gdat.indxtargtodo = np.array([], dtype=int)
+    else:
+        booltargtodo = ~gdat.boolcomptarg
+        if gdat.indxshrd is not None:
+            gdat.indxshrdtarg = retr_indxshrdtarg(gdat.strgtarg, gdat.numbshrd, gdat.typeshrd)
+            booltargtodo &= gdat.indxshrdtarg == gdat.indxshrd
+            logg.info('Shard %d of %d has %d targets.', gdat.indxshrd, gdat.numbshrd, np.sum(gdat.indxshrdtarg == gdat.indxshrd))
+        gdat.indxtargtodo = np.where(booltargtodo)[0]
+    
+    # targets expected to be far below the detection threshold are recorded as negatives without being analyzed
+    if gdat.thrssdeeskip is not None and hasattr(gdat, 'sdeeexpctarg'):
+        boolskip = gdat.sdeeexpctarg[gdat.indxtargtodo] < gdat.thrssdeeskip
+        logg.info('Skipping the analysis of %d targets with expected SDE below %.3g...', np.sum(boolskip), gdat.thrssdeeskip)
+        for n in gdat.indxtargtodo[boolskip]:
+            dictrslt = retr_dictrslttargskip(gdat, n)
+            setp_rslttarg(gdat, dictrslt)
+            writ_ledgtarg(gdat, dictrslt)
+        gdat.indxtargtodo = gdat.indxtargtodo[~boolskip]
+    
+    # expected execution time of each target, used to schedule targets longest-expected-first
+    if hasattr(gdat, 'timeexecmeastarg') and (np.isfinite(gdat.timeexecmeastarg) & ~gdat.boolplottarg).any():
+        # median of the execution times measured in a previous run
+        gdat.timeexecexpctarg = np.full(gdat.numbtarg, np.nanmedian(gdat.timeexecmeastarg[~gdat.boolplottarg]))
+    else:
+        gdat.timeexecexpctarg = np.full(gdat.numbtarg, gdat.timeexectarg)
+    ## targets with more sectors of data take longer
+    if 'numbtsec' in gdat.dictfeatprio:
+        numbtsec = np.asarray(gdat.dictfeatprio['numbtsec'], dtype=float)
+        if np.isfinite(numbtsec).any() and np.nanmedian(numbtsec) > 0.:
+            factnumbtsec = numbtsec / np.nanmedian(numbtsec)
+            factnumbtsec[~np.isfinite(factnumbtsec) | (factnumbtsec <= 0.)] = 1.
+            gdat.timeexecexpctarg *= factnumbtsec
+    ## targets for which miletos makes plots take longer
+    gdat.timeexecexpctarg[:gdat.numbtargplot] *= 2.
+    
+    # priority of each target, which is its expected yield per CPU second if the targets are analyzed in the order of yield
+    if gdat.typeordetarg is None:
+        if hasattr(gdat, 'indxtic8targ'):
+            gdat.typeordetarg = 'yield'
+        else:
+            gdat.typeordetarg = 'cost'
+    gdat.yieldexpctarg = retr_yieldexpctarg(gdat)
+    if gdat.typeordetarg == 'yield':
+        gdat.prioexpctarg = gdat.yieldexpctarg / gdat.timeexecexpctarg
+        gdat.indxtargtodo = gdat.indxtargtodo[np.argsort(-gdat.prioexpctarg[gdat.indxtargtodo], kind='stable')]
+    elif gdat.typeordetarg == 'cost':
+        gdat.prioexpctarg = None
+    else:
+        raise Exception('Unknown typeordetarg: %s' % gdat.typeordetarg)
+    logg.info('Expected execution time of the remaining targets: %.3g CPU hours', np.sum(gdat.timeexecexpctarg[gdat.indxtargtodo]) / 3600.)
+    
+    # the containers of the statistics are needed by the aggregation even if no target is left to be analyzed
+    if not hasattr(gdat, 'dictstat'):
+        setp_clasdisp(gdat, retr_dictboolanls(gdat.typemile))
+    
+    timewall, timecpuu = updt_timestagpopl(gdat, 'setp', timewall, timecpuu)
+    
+    # progress of the analysis of targets
+    gdat.numbtargcomp = np.sum(gdat.boolcomptarg)
+    gdat.numbtargcompsess = 0
+    gdat.numbtargdisp = 0
+    gdat.listtimewallcomp = collections.deque(maxlen=gdat.numbtargrate)
+    gdat.timewallwork = time.perf_counter()
+    gdat.timewallprog = gdat.timewallwork
+    
+    if boolprocmult and gdat.indxtargtodo.size > 0:
         import multiprocessing
-        from functools import partial
-        multiprocessing.set_start_method('spawn')
-
-        if __name__ == '__main__':
-            if platform.system() == "Darwin":
-                multiprocessing.set_start_method('spawn')
+        
+        objtcont = multiprocessing.get_context('spawn')
 
-        numbproc = min(multiprocessing.cpu_count() - 1, gdat.numbtarg)
+        numbproc = max(1, min(objtcont.cpu_count() - 1, gdat.indxtargtodo.size))
         
-        print('Generating %d processes...' % numbproc)
+        # chunks of targets to be dispatched dynamically to the pool
+        listindxtargwork = retr_listindxtargwork(gdat.indxtargtodo, gdat.timeexecexpctarg, numbproc, prio=gdat.prioexpctarg)
         
-        objtpool = multiprocessing.Pool(numbproc)
-        numbproc = objtpool._processes
-        indxproc = np.arange(numbproc)
-
-        gdat.listindxtarg = [[] for p in indxproc]
-        indxproctarg = np.linspace(0, numbproc - 1, gdat.numbtarg).astype(int)
-        for p in indxproc:
-            gdat.listindxtarg[p] = np.where(indxproctarg == p)[0]
-        listgdat = objtpool.map(partial(mile_work, gdat), indxproc)
+        if gdat.boolprefmast:
+            strt_prefmast(gdat, np.concatenate(listindxtargwork))
+        
+        logg.info('Generating %d processes to analyze %d targets in %d chunks...', numbproc, gdat.indxtargtodo.size, len(listindxtargwork))
+        
+        # persistent pool, where the global object is sent to each process once, and idle processes pull the next chunk
+        ## at most two chunks per process are dispatched at a time, so that the dispatched targets drive the look-ahead window of the prefetch
+        queurslt = queue.Queue()
+        with objtcont.Pool(numbproc, initializer=init_work, initargs=(retr_gdatwork(gdat),)) as objtpool:
+            k = 0
+            numbchunflig = 0
+            while k < len(listindxtargwork) or numbchunflig > 0:
+                while k < len(listindxtargwork) and numbchunflig < 2 * numbproc:
+                    objtpool.apply_async(proc_work, (listindxtargwork[k],), callback=queurslt.put, error_callback=queurslt.put)
+                    gdat.numbtargdisp += listindxtargwork[k].size
+                    numbchunflig += 1
+                    k += 1
+                
+                if hasattr(gdat, 'objtpoolpref'):
+                    subm_prefmast(gdat)
+                
+                listdictrslt = queurslt.get()
+                numbchunflig -= 1
+                if isinstance(listdictrslt, BaseException):
+                    raise listdictrslt
+                for dictrslt in listdictrslt:
+                    updt_rslttarg(gdat, dictrslt)
     else:
-        gdat.listindxtarg = [gdat.indxtarg]
-        temp = mile_work(gdat, 0)
+        if gdat.boolprefmast:
+            strt_prefmast(gdat, gdat.indxtargtodo)
+        
+        for n in gdat.indxtargtodo:
+            gdat.numbtargdisp += 1
+            if hasattr(gdat, 'objtpoolpref'):
+                subm_prefmast(gdat)
+            
+            for dictrslt in mile_work(gdat, [n]):
+                updt_rslttarg(gdat, dictrslt)
+    
+    if hasattr(gdat, 'objtpoolpref'):
+        stop_prefmast(gdat)
+
+    gdat.timewallworkdone = time.perf_counter()
+    timewall, timecpuu = updt_timestagpopl(gdat, 'work', timewall, timecpuu)
+    
+    if gdat.boolsimusome and hasattr(gdat, 'dictaccuperf'):
+        writ_accuperf(gdat)
     
+    if hasattr(gdat, 'dicttablfeat'):
+        for namecols in gdat.dicttablfeat:
+            gdat.dicttablfeat[namecols].flush()
+        logg.info('The table of per-target features is in %s.', gdat.pathtablfeat)
+    
+    # the analysis of the population is left to the merge step if only a shard is analyzed
+    if gdat.indxshrd is not None:
+        wait_plot(gdat, objtpoolplot, listfutuplot)
+        timewall, timecpuu = updt_timestagpopl(gdat, 'plotwait', timewall, timecpuu)
+        writ_timeexec(gdat)
+        return gdat
+
     if gdat.boolsimusome:
+        # positivity of the relevant targets and relevance of the positive targets, in the order of targets
+        gdat.boolposirele = [[[] for v in gdat.indxtypeclastrue] for u in gdat.indxtypeclasdisp]
+        gdat.boolreleposi = [[[] for v in gdat.indxtypeclastrue] for u in gdat.indxtypeclasdisp]
         for u in gdat.indxtypeclasdisp:
             for v in gdat.indxtypeclastrue:
-                gdat.boolposirele[u][v] = np.array(gdat.boolposirele[u][v], dtype=bool)
-                gdat.boolreleposi[u][v] = np.array(gdat.boolreleposi[u][v], dtype=bool)
+                gdat.boolposirele[u][v] = gdat.boolpositarg[u][gdat.boolreletarg[v]]
+                gdat.boolreleposi[u][v] = gdat.boolreletarg[v][gdat.boolpositarg[u]]
     
     gdat.dictindxtarg['posi'] = [[] for u in gdat.indxtypeclasdisp]
     gdat.dictindxtarg['nega'] = [[] for u in gdat.indxtypeclasdisp]
@@ -941,6 +2896,19 @@ def init( \
         gdat.dictindxtarg['posi'][u] = np.where(gdat.boolpositarg[u])[0]
         gdat.dictindxtarg['nega'][u] = np.setdiff1d(gdat.indxtarg, gdat.dictindxtarg['posi'][u])
     
+    # confusion sets of all pairs of disposition and true classes
+    if gdat.boolsimusome:
+        gdat.dictconf = retr_dictconf(np.array(gdat.boolpositarg), np.array(gdat.boolreletarg))
+    
+    # disposition features of each disposition class as arrays of shape (numbfeat, numbtarg) to be gathered at once
+    gdat.dictarryfeatstat = dict()
+    for namepopl in gdat.dictstat:
+        gdat.dictarryfeatstat[namepopl] = np.vstack([gdat.dictstat[namepopl][namefeat][0] for namefeat in gdat.listnamefeatstat])
+
+    timewall, timecpuu = updt_timestagpopl(gdat, 'aggr', timewall, timecpuu)
+    
+    writ_timeexec(gdat)
+
     # for each positive and relevant type, estimate the recall and precision
 
     for u in gdat.indxtypeclasdisp:
@@ -972,23 +2940,16 @@ def init( \
             gdat.dictindxtargtemp[strguuvv + 'ne'] = gdat.dictindxtarg['nega'][u]
             gdat.dictindxtargtemp[strguuvv + 'po'] = gdat.dictindxtarg['posi'][u]
             
-            gdat.dictindxtargtemp[strguuvv + 'trpo'] = np.intersect1d(gdat.dictindxtarg['posi'][u], gdat.dictindxtarg['rele'][v])
-            gdat.dictindxtargtemp[strguuvv + 'trne'] = np.intersect1d(gdat.dictindxtarg['nega'][u], gdat.dictindxtarg['irre'][v])
-            gdat.dictindxtargtemp[strguuvv + 'flpo'] = np.intersect1d(gdat.dictindxtarg['posi'][u], gdat.dictindxtarg['irre'][v])
-            gdat.dictindxtargtemp[strguuvv + 'flne'] = np.intersect1d(gdat.dictindxtarg['nega'][u], gdat.dictindxtarg['rele'][v])
+            for nameconf in ['trpo', 'trne', 'flpo', 'flne']:
+                gdat.dictindxtargtemp[strguuvv + nameconf] = gdat.dictconf['indx'][nameconf][u][v]
             
             # determine positive population and negative populations for classification of targets based on disposition properties
-            if u == 0:
-                if gdat.typesyst == 'PlanetarySystem':
-                    namepoplclasdispposi = 'HighBLSpower'
-                    listnamepoplclasdispnega = ['LowBLSpower']
+            namepoplclasdispposi = gdat.listnameclasdisp[u]
+            listnamepoplclasdispnega = [gdat.listnameclasdisp[uu] for uu in gdat.indxtypeclasdisp if uu != u]
 
             # determine relevant population and irrelevant populations for classification of targets based on true properties
-            if v == 0:
-                if gdat.typesyst == 'PlanetarySystem':
-                    dict_keys(['PlanetarySystem_SyntheticPopulation_All', 'PlanetarySystem_SyntheticPopulation_Transiting'])
-                    namepoplclastruerele = 'PlanetarySystem_SyntheticPopulation_Transiting'
-                    listnamepoplclastrueirre = ['PlanetarySystem_SyntheticPopulation_Nontransiting']
+            namepoplclastruerele = gdat.listnamepopltruerele[v]
+            listnamepoplclastrueirre = gdat.listlistnamepopltrueirre[v]
             
             for strgkeyy in gdat.dictindxtargtemp:
                 if len(gdat.dictindxtargtemp[strgkeyy]) > 0:
@@ -997,34 +2958,35 @@ def init( \
                     
                     # disposition features
                     ## of the positive population
-                    for namefeat in gdat.listnamefeatstat:
-                        tdpy.setp_dict(gdat.dicttarg[strgkeyy], namefeat, gdat.dictstat[namepoplclasdispposi][namefeat][0][gdat.dictindxtargtemp[strgkeyy]])
+                    arryfeat = gdat.dictarryfeatstat[namepoplclasdispposi][:, gdat.dictindxtargtemp[strgkeyy]]
+                    for k, namefeat in enumerate(gdat.listnamefeatstat):
+                        tdpy.setp_dict(gdat.dicttarg[strgkeyy], namefeat, arryfeat[k, :])
                     ## of the negatives population
                     for namepopl in listnamepoplclasdispnega:
-                        for namefeat in gdat.listnamefeatstat:
-                            if gdat.booldiag:
-                                if not namepopl in gdat.dictstat:
-                                    print('')
-                                    print('')
-                                    print('')
-                                    print('gdat.dictstat.keys()')
-                                    print(gdat.dictstat.keys())
-                                    print('namepopl')
-                                    print(namepopl)
-                                    raise Exception('not namepopl in gdat.dictstat')
-
-                            tdpy.setp_dict(gdat.dicttarg[strgkeyy], namefeat, gdat.dictstat[namepopl][namefeat][0][gdat.dictindxtargtemp[strgkeyy]])
+                        if gdat.booldiag:
+                            if not namepopl in gdat.dictstat:
+                                print('')
+                                print('')
+                                print('')
+                                print('gdat.dictstat.keys()')
+                                print(gdat.dictstat.keys())
+                                print('namepopl')
+                                print(namepopl)
+                                raise Exception('not namepopl in gdat.dictstat')
+                        
+                        arryfeat = gdat.dictarryfeatstat[namepopl][:, gdat.dictindxtargtemp[strgkeyy]]
+                        for k, namefeat in enumerate(gdat.listnamefeatstat):
+                            tdpy.setp_dict(gdat.dicttarg[strgkeyy], namefeat, arryfeat[k, :])
 
                     # true features
                     ## of the relevant population
-                    print('gdat.dictpopltrue')
-                    print(gdat.dictpopltrue.keys())
+                    logg.debug('gdat.dictpopltrue: %s', gdat.dictpopltrue.keys())
                     for namefeat in gdat.dictpopltrue[namepoplclastruerele].keys():
-                        tdpy.setp_dict(gdat.dicttarg[strgkeyy], namefeat, gdat.dictpopltrue[namepoplclastruerele][namefeat][0][gdat.dictindxtargtemp[strgkeyy]])
+                        tdpy.setp_dict(gdat.dicttarg[strgkeyy], namefeat, retr_featpopltrue(gdat, namepoplclastruerele, namefeat, gdat.dictindxtargtemp[strgkeyy]))
                     ## of the irrelevant populations
                     for namepopl in listnamepoplclastrueirre:
                         for namefeat in gdat.dictpopltrue[namepopl].keys():
-                            tdpy.setp_dict(gdat.dicttarg[strgkeyy], namefeat, gdat.dictpopltrue[namepopl][namefeat][0][gdat.dictindxtargtemp[strgkeyy]])
+                            tdpy.setp_dict(gdat.dicttarg[strgkeyy], namefeat, retr_featpopltrue(gdat, namepopl, namefeat, gdat.dictindxtargtemp[strgkeyy]))
             
             listdictlablcolrpopl = []
             listboolcompexcl = []
@@ -1032,20 +2994,13 @@ def init( \
             listnamepoplcomm = list(gdat.dicttarg.keys())
             strgtemp = 'stat' + strguuvv
             
-            print('u, v')
-            print(u, v)
-            print('strguuvv')
-            print(strguuvv)
-            print('listnamepoplcomm')
-            print(listnamepoplcomm)
-            print('gdat.listlablrele')
-            print(gdat.listlablrele)
-            print('gdat.listlablclasdisp')
-            print(gdat.listlablclasdisp)
-            print('listdictlablcolrpopl')
-            print(listdictlablcolrpopl)
-            print('gdat.indxtypeclastrue')
-            print(gdat.indxtypeclastrue)
+            logg.debug('u, v: %d, %d', u, v)
+            logg.debug('strguuvv: %s', strguuvv)
+            logg.debug('listnamepoplcomm: %s', listnamepoplcomm)
+            logg.debug('gdat.listlablrele: %s', gdat.listlablrele)
+            logg.debug('gdat.listlablclasdisp: %s', gdat.listlablclasdisp)
+            logg.debug('listdictlablcolrpopl: %s', listdictlablcolrpopl)
+            logg.debug('gdat.indxtypeclastrue: %s', gdat.indxtypeclastrue)
             
             boolgood = False
             for namepoplcomm in listnamepoplcomm:
@@ -1105,20 +3060,19 @@ def init( \
             
             typecnfg = '%s' % (gdat.strgextn)
             
-            print('listdictlablcolrpopl')
-            print(listdictlablcolrpopl)
-            print('listboolcompexcl')
-            print(listboolcompexcl)
-            print('listtitlcomp')
-            print(listtitlcomp)
+            logg.debug('listdictlablcolrpopl: %s', listdictlablcolrpopl)
+            logg.debug('listboolcompexcl: %s', listboolcompexcl)
+            logg.debug('listtitlcomp: %s', listtitlcomp)
 
             for dictlablcolrpopl in listdictlablcolrpopl:
                 if len(dictlablcolrpopl) == 0:
                     raise Exception('')
 
+            timewall, timecpuu = updt_timestagpopl(gdat, 'aggr', timewall, timecpuu)
+            
             pathvisu = gdat.pathvisucnfg + 'Features/'
             pathdata = gdat.pathdatacnfg + 'Features/'
-            pergamon.init( \
+            subm_plot(objtpoolplot, listfutuplot, 'plotfeat', 'pergamon', 'init', \
                           dictpopl=gdat.dicttarg, \
                           listdictlablcolrpopl=listdictlablcolrpopl, \
                           listboolcompexcl=listboolcompexcl, \
@@ -1129,7 +3083,7 @@ def init( \
                           boolsortpoplsize=False, \
                          )
             
-            print('Will plot precision and recall...')
+            logg.info('Will plot precision and recall...')
             if gdat.boolplot and gdat.boolsimusome and u != -1 and v != -1:
                 listvarbreca = []
                 
@@ -1166,45 +3120,14 @@ def init( \
                 #print(gdat.boolreleposi[u][v])
 
                 strgextn = '%s_%s' % (gdat.typepopl, strguuvv)
-                tdpy.plot_recaprec(gdat.pathvisucnfg, strgextn, listvarbreca, listvarbprec, liststrgvarbreca, liststrgvarbprec, \
+                subm_plot(objtpoolplot, listfutuplot, 'plotfeat', 'tdpy', 'plot_recaprec', gdat.pathvisucnfg, strgextn, listvarbreca, listvarbprec, liststrgvarbreca, liststrgvarbprec, \
                                         listlablvarbreca, listlablvarbprec, gdat.boolposirele[u][v], gdat.boolreleposi[u][v])
+            
+            timewall, timecpuu = updt_timestagpopl(gdat, 'plotfeat', timewall, timecpuu)
+    
+    wait_plot(gdat, objtpoolplot, listfutuplot)
+    timewall, timecpuu = updt_timestagpopl(gdat, 'plotwait', timewall, timecpuu)
 
-
-        #if gdat.typecnfg == 'CompactObjectStellarCompanion' or gdat.typecnfg == 'psys' or gdat.typecnfg == 'plan':
-        #    
-        #        # calculate photometric precision for the star population
-        #        if typeinst.startswith('tess'):
-        #            gdat.dictpopl[namepoplcomptran]['nois'] = nicomedia.retr_noistess(gdat.dictpopl[namepoplcomptran]['magtsystTESS'])
-        #        elif typeinst.startswith('lsst'):
-        #            gdat.dictpopl[namepoplcomptran]['nois'] = nicomedia.retr_noislsst(gdat.dictpopl[namepoplcomptran]['rmag'])
-        #    
-        #        # expected BLS signal detection efficiency
-        #        if typeinst.startswith('lsst'):
-        #            numbvisi = 1000
-        #            gdat.dictpopl[namepoplcomptran]['sdee'] = gdat.dictpopl[namepoplcomptran]['depttrancomp'] / 5. / gdat.dictpopl[namepoplcomptran]['nois'] * \
-        #                                                                                                 np.sqrt(gdat.dictpopl[namepoplcomptran]['dcyc'] * numbvisi)
-        #        if typeinst.startswith('tess'):
-        #            if gdat.typecnfg == 'plan':
-        #                gdat.dictpopl[namepoplcomptran]['sdee'] = np.sqrt(gdat.dictpopl[namepoplcomptran]['duratrantotl']) * \
-        #                                                                    gdat.dictpopl[namepoplcomptran]['depttrancomp'] / gdat.dictpopl[namepoplcomptran]['nois']
-        #            if gdat.typecnfg == 'CompactObjectStellarCompanion':
-        #                gdat.dictpopl[namepoplcomptran]['sdee'] = np.sqrt(gdat.dictpopl[namepoplcomptran]['duratrantotl']) * \
-        #                                                                                        gdat.dictpopl[namepoplcomptran]['amplslen'] \
-        #                                                                                                               / gdat.dictpopl[namepoplcomptran]['nois']
-        #        
-        #        # expected detections
-        #        #gdat.dictpopl[namepoplcomptran]['probdeteusam'] = np.exp(-(0.01 * gdat.dictpopl[namepoplcomptran]['pericomp'] * gdat.dictpopl[namepoplcomptran]['numbtsec']))
-        #        #booldeteusam = np.random.rand(gdat.dictpopl[namepoplcomptran]['pericomp'].size) < gdat.dictpopl[namepoplcomptran]['probdeteusam']
-        #        
-        #        #indx = (gdat.dictpopl[namepoplcomptran]['sdee'] > 5) & booldeteusam
-        #        indx = (gdat.dictpopl[namepoplcomptran]['sdee'] > 5)
-        #        retr_subp(gdat.dictpopl, gdat.dictnumbsamp, gdat.dictindxsamp, namepoplcomptran, 'compstar' + typepoplsyst + 'tranposi', indx)
-
-        #        # expected non-detections
-        #        #indx = (gdat.dictpopl[namepoplcomptran]['sdee'] < 5) | (~booldeteusam)
-        #        indx = (gdat.dictpopl[namepoplcomptran]['sdee'] < 5)
-        #        retr_subp(gdat.dictpopl, gdat.dictnumbsamp, gdat.dictindxsamp, namepoplcomptran, 'compstar' + typepoplsyst + 'trannega', indx)
-
-
-
-
+    writ_timeexec(gdat)
+    
+    return gdat